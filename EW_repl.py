@@ -69,10 +69,14 @@ def is_balanced(code):
     # 如果栈为空，则所有括号都已正确闭合
     return len(stack) == 0
 
-def repl():
+def repl(numeric: NumericContext | None = None):
     """
     交互式解释器 (Read-Eval-Print Loop)
+    
+    Args:
+        numeric: 数值运算环境，默认使用当前生效的环境
     """
+    numeric = numeric or get_numeric_context()
     print(welcome)
     lexer = core.Lexer.Lexer()
     while True:
@@ -99,10 +103,11 @@ def repl():
                     prompt = "... "
             
             # 使用完整的缓冲区进行词法分析和解析
-            tok = lexer.tokenize(buffer + '\n')
-            fin = run(parse(tok, buffer), now_env)
-            if fin is not None:
-                print(fin)
+            with numeric:
+                tok = lexer.tokenize(buffer + '\n')
+                fin = run(parse(tok, buffer), now_env, numeric)
+                if fin is not None:
+                    print(fin)
         except KeyboardInterrupt:
             try:
                 print()
@@ -0,0 +1,75 @@
+# 分配次数的基准测试：统计循环密集型脚本中新建的数字与布尔对象个数
+
+from benchutil import bench, run_ew, report
+
+import core.Type as Type
+from core.Type import EW_Boolean, EW_Number, EW_Type
+
+LOOP = '''
+i = 0
+s = 0
+while (i < {n}) {{
+    if (i < 100) {{ s = s + 1 }}
+    i = i + 1
+}}
+'''
+
+NESTED = '''
+i = 0
+c = 0
+while (i < {n}) {{
+    j = 0
+    while (j < 10) {{
+        if (j == 5 or j == 7) {{ c = c + 1 }}
+        j = j + 1
+    }}
+    i = i + 1
+}}
+'''
+
+
+def count_allocations(func):
+    """运行func，返回期间新建的EW_Number与EW_Boolean个数（不含共享实例）"""
+    shared = {id(value) for value in getattr(Type, '_small_ints', [])}
+    shared.update(id(getattr(Type, name)) for name in ('TRUE', 'FALSE') if hasattr(Type, name))
+    count = 0
+    
+    original_number_init = EW_Number.__init__
+    original_type_init = EW_Type.__init__
+    original_from_decimal = EW_Number.__dict__['from_decimal']
+    
+    def number_init(self, value):
+        nonlocal count
+        count += 1
+        original_number_init(self, value)
+    
+    def type_init(self, value):
+        nonlocal count
+        if isinstance(self, EW_Boolean):
+            count += 1
+        original_type_init(self, value)
+    
+    def from_decimal(cls, value):
+        nonlocal count
+        number = original_from_decimal.__func__(cls, value)
+        if id(number) not in shared:
+            count += 1
+        return number
+    
+    EW_Number.__init__ = number_init
+    EW_Type.__init__ = type_init
+    EW_Number.from_decimal = classmethod(from_decimal)
+    try:
+        func()
+    finally:
+        EW_Number.__init__ = original_number_init
+        EW_Type.__init__ = original_type_init
+        EW_Number.from_decimal = original_from_decimal
+    return count
+
+
+if __name__ == '__main__':
+    for name, code in (('loop with if (5000)', LOOP.format(n=5000)),
+                       ('nested loop with or (500)', NESTED.format(n=500))):
+        print(f'{name:<40} {count_allocations(lambda: run_ew(code)):>10} objects')
+        report(name, bench(lambda: run_ew(code), repeat=3))
@@ -0,0 +1,35 @@
+# 算术运算的微基准测试：测量运算结果构造的开销
+
+from benchutil import bench, run_ew, report
+
+from core.Type import EW_Number
+
+N = 100000
+
+DECIMAL_LOOP = '''
+i = 0
+x = 0
+while (i < {n}) {{
+    x = x + 0.25
+    i = i + 1
+}}
+'''
+
+
+def binary_op(op, left, right, n=N):
+    """对同一对操作数重复执行n次运算"""
+    for _ in range(n):
+        op(left, right)
+
+
+if __name__ == '__main__':
+    a = EW_Number('1.5')
+    b = EW_Number('0.25')
+    i = EW_Number(7)
+    j = EW_Number(3)
+    report('decimal + (100000)', bench(lambda: binary_op(EW_Number.__add__, a, b)))
+    report('decimal * (100000)', bench(lambda: binary_op(EW_Number.__mul__, a, b)))
+    report('decimal / (100000)', bench(lambda: binary_op(EW_Number.__truediv__, a, b)))
+    report('int + (100000)', bench(lambda: binary_op(EW_Number.__add__, i, j)))
+    report('int / (100000)', bench(lambda: binary_op(EW_Number.__truediv__, i, j)))
+    report('interpreted decimal loop (10000)', bench(lambda: run_ew(DECIMAL_LOOP.format(n=10000))))
@@ -0,0 +1,31 @@
+# 内置函数与包函数调用的基准测试：解释器执行单个调用表达式的吞吐量
+
+from benchutil import bench, report
+
+from core.Lexer import Lexer
+from core.Parser import Interpreter, parse
+from core.Type import EW_List, EW_Number
+
+N = 100000
+
+
+def call_node(code):
+    """解析只含一个调用表达式的代码，返回其AST节点"""
+    return parse(Lexer().tokenize(code + '\n'), code)[0]
+
+
+def execute(interpreter, node, n=N):
+    """重复执行同一个调用节点n次"""
+    run = interpreter._execute_node
+    for _ in range(n):
+        run(node)
+
+
+if __name__ == '__main__':
+    interpreter = Interpreter()
+    interpreter.env['l'] = EW_List([EW_Number(1)])
+    interpreter.env['x'] = EW_Number(1)
+    interpreter._execute_node(call_node('import list'))
+    report(f'builtin len(l) ({N})', bench(lambda: execute(interpreter, call_node('len(l)'))))
+    report(f'builtin type(x) ({N})', bench(lambda: execute(interpreter, call_node('type(x)'))))
+    report(f'package list.append(l, x) ({N})', bench(lambda: execute(interpreter, call_node('list.append(l, x)'))))
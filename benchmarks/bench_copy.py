@@ -0,0 +1,49 @@
+# copy()的基准测试：写时复制快照与深拷贝的对比
+
+from copy import deepcopy
+
+from benchutil import bench, report
+
+from core.ew_builtins import ew_builtins
+from core.Type import EW_List, EW_Number, EW_String, EW_Table
+
+# 直接调用内置函数的实现，避免调试日志对参数的格式化
+ew_copy = ew_builtins['copy'].func
+
+
+def flat_table(n):
+    return EW_Table({EW_Number(k): EW_Number(k) for k in range(n)})
+
+
+def nested_table(rows, cols):
+    return EW_Table({EW_Number(r): EW_Table({EW_Number(c): EW_List([EW_Number(c)]) for c in range(cols)})
+                     for r in range(rows)})
+
+
+def copy_then_set(table, copier, key, value):
+    """复制后修改一个键"""
+    copied = copier(table)
+    copied[key] = value
+    return copied
+
+
+def copy_then_set_nested(table, copier, row, col, value):
+    """复制后修改嵌套Table中的一个键"""
+    copied = copier(table)
+    copied[row][col] = value
+    return copied
+
+
+if __name__ == '__main__':
+    key = EW_Number(12345)
+    value = EW_String('changed', without_quote=False)
+    table = flat_table(1000000)
+    report('copy only (1M table)', bench(lambda: ew_copy(table)))
+    report('copy + set one key (1M table)', bench(lambda: copy_then_set(table, ew_copy, key, value)))
+    report('deepcopy + set one key (1M table)', bench(lambda: copy_then_set(table, deepcopy, key, value), repeat=1))
+    
+    nested = nested_table(1000, 1000)
+    row, col = EW_Number(500), EW_Number(500)
+    report('copy + set nested key (1000x1000)', bench(lambda: copy_then_set_nested(nested, ew_copy, row, col, value)))
+    report('deepcopy + set nested key (1000x1000)',
+           bench(lambda: copy_then_set_nested(nested, deepcopy, row, col, value), repeat=1))
@@ -0,0 +1,48 @@
+# 列表构造的基准测试：原地append与复制式push的扩展性对比
+
+from benchutil import bench, run_ew, report
+
+from core.Package import load_package
+from core.Type import EW_List, EW_Number
+
+APPEND_LOOP = '''
+import list
+l = []
+i = 0
+while (i < {n}) {{
+    list.append(l, i)
+    i = i + 1
+}}
+'''
+
+PUSH_LOOP = '''
+import list
+l = []
+i = 0
+while (i < {n}) {{
+    l = list.push(l, i)
+    i = i + 1
+}}
+'''
+
+
+def build(func, n):
+    """直接调用包函数，用func逐个添加n个元素构造列表"""
+    item = EW_Number(1)
+    nlist = EW_List()
+    for _ in range(n):
+        result = func(nlist, item)
+        if result is not None:
+            nlist = result
+    return nlist
+
+
+if __name__ == '__main__':
+    lst = load_package('list')
+    for n in (10000, 100000, 1000000):
+        report(f'list.append ({n})', bench(lambda: build(lst['append'], n), repeat=3))
+    for n in (10000, 20000, 40000):
+        report(f'list.push ({n})', bench(lambda: build(lst['push'], n), repeat=3))
+    for n in (1000, 2000):
+        report(f'interpreted append loop ({n})', bench(lambda: run_ew(APPEND_LOOP.format(n=n)), repeat=3))
+        report(f'interpreted push loop ({n})', bench(lambda: run_ew(PUSH_LOOP.format(n=n)), repeat=3))
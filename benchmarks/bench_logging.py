@@ -0,0 +1,55 @@
+# 调试日志的基准测试：关闭时的单次调用开销，以及解释执行时关闭与打开日志的对比
+
+from time import localtime, strftime
+
+from benchutil import bench, run_ew, report
+
+from core.Log import DEBUG, OFF, RingBuffer, configure_logging, get_logger
+from core.Type import EW_Number
+
+N = 200000
+
+LOOP = '''
+t = {{}}
+i = 0
+while (i < {n}) {{
+    t[i] = i * 2
+    x = t[i]
+    i = i + 1
+}}
+'''
+
+
+def noop(msg, *args):
+    """空函数，作为函数调用本身开销的参照"""
+
+
+def old_clog(msg):
+    """原来的clog：无论是否输出都先读取时间"""
+    timenow = strftime('%H:%M:%S', localtime())
+    if 0:
+        print(f'[DEBUG OUTPUT {timenow}] {msg}\n', flush=True)
+
+
+def calls(n):
+    log = get_logger('bench')
+    value = EW_Number(7)
+    report(f'empty function call ({n})', bench(lambda: [noop('x: %s', value) for _ in range(n)]))
+    report(f'disabled debug() ({n})', bench(lambda: [log.debug('x: %s', value) for _ in range(n)]))
+    report(f'old clog(f-string) ({n})', bench(lambda: [old_clog(f'x: {value}') for _ in range(n)]))
+
+
+def interpreter(n):
+    code = LOOP.format(n=n)
+    configure_logging(OFF)
+    report(f'interpreted loop, logging off ({n})', bench(lambda: run_ew(code)))
+    # 打开日志后每条语句都要格式化变量与环境，只运行较少的迭代
+    code = LOOP.format(n=n // 10)
+    configure_logging(DEBUG, sink=RingBuffer(1000))
+    report(f'interpreted loop, debug to ring ({n // 10})', bench(lambda: run_ew(code), repeat=1))
+    configure_logging(OFF)
+
+
+if __name__ == '__main__':
+    calls(N)
+    interpreter(2000)
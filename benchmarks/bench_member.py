@@ -0,0 +1,29 @@
+# 包成员访问的基准测试：循环中反复调用包函数（math.add等）
+
+from benchutil import bench, run_ew, report
+
+PACKAGE_LOOP = '''
+import math
+i = 0
+s = 0
+while (i < {n}) {{
+    s = math.add(s, math.max(i, 1))
+    i = math.add(i, 1)
+}}
+'''
+
+# 作为参照：同样次数的Table成员访问
+TABLE_LOOP = '''
+t = {{"one": 1}}
+i = 0
+s = 0
+while (i < {n}) {{
+    s = s + t.one
+    i = i + t.one
+}}
+'''
+
+
+if __name__ == '__main__':
+    report('package calls (3 x 5000)', bench(lambda: run_ew(PACKAGE_LOOP.format(n=5000))))
+    report('table member access (2 x 5000)', bench(lambda: run_ew(TABLE_LOOP.format(n=5000))))
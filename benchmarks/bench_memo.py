@@ -0,0 +1,50 @@
+# 记忆化的基准测试：以网格（List的List）为参数的动态规划
+
+from benchutil import bench, run_ew, report
+
+from core.Memo import memo_key
+from core.Type import EW_List, EW_Number
+
+# 统计网格中从左上角到(r, c)的路径数，网格中值为1的格子不可通过
+GRID_PATHS = '''
+mfunc paths(grid, r, c) {{
+    if (grid[r][c] == 1) {{ return 0 }}
+    if (r == 0 and c == 0) {{ return 1 }}
+    total = 0
+    if (r > 0) {{ total = total + paths(grid, r - 1, c) }}
+    if (c > 0) {{ total = total + paths(grid, r, c - 1) }}
+    return total
+}}
+grid = [{rows}]
+result = paths(grid, {last}, {last})
+'''
+
+
+def grid_source(n):
+    rows = ', '.join('[' + ', '.join('1' if (r * 7 + c * 3) % 11 == 0 and r + c else '0'
+                                     for c in range(n)) + ']' for r in range(n))
+    return GRID_PATHS.format(rows=rows, last=n - 1)
+
+
+def make_grid(n):
+    return EW_List([EW_List([EW_Number((r + c) % 2) for c in range(n)]) for r in range(n)])
+
+
+def key_calls(grid, calls, clear):
+    """重复为同一个网格生成缓存键；clear为真时每次先清除指纹缓存"""
+    r = EW_Number(1)
+    for _ in range(calls):
+        if clear:
+            grid._fingerprint = None
+            for row in grid:
+                row._fingerprint = None
+        memo_key([grid, r, r])
+
+
+if __name__ == '__main__':
+    grid = make_grid(200)
+    report('memo key, cached fingerprint (200x200)', bench(lambda: key_calls(grid, 100, False)))
+    report('memo key, recomputed (200x200)', bench(lambda: key_calls(grid, 100, True), repeat=3))
+    for n in (6, 10):
+        source = grid_source(n)
+        report(f'interpreted grid paths DP ({n}x{n})', bench(lambda: run_ew(source), repeat=3))
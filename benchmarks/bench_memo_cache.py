@@ -0,0 +1,34 @@
+# 记忆化缓存策略的基准测试：不限容量、LRU淘汰与TTL的开销对比
+
+from benchutil import bench, run_ew, report
+
+from core.Memo import MISSING, MemoCache
+
+N = 200000
+
+FIB = '''
+import deco
+{decorator} func fib(n) {{
+    if (n < 2) {{ return n }}
+    return fib(n - 1) + fib(n - 2)
+}}
+r = fib({n})
+'''
+
+
+def workload(cache, n=N, domain=10000):
+    """在domain个不同的键上反复查找并写入，模拟记忆化调用"""
+    for i in range(n):
+        key = ((i * 7919) % domain,)
+        if cache.get(key) is MISSING:
+            cache.put(key, i)
+
+
+if __name__ == '__main__':
+    report(f'unbounded get/put ({N})', bench(lambda: workload(MemoCache())))
+    report(f'lru(100000) get/put, no evictions ({N})', bench(lambda: workload(MemoCache(100000))))
+    report(f'lru(1000) get/put, evicting ({N})', bench(lambda: workload(MemoCache(1000))))
+    report(f'ttl(60) get/put ({N})', bench(lambda: workload(MemoCache(ttl=60))))
+    report(f'lru(1000) + ttl(60) get/put ({N})', bench(lambda: workload(MemoCache(1000, 60))))
+    for decorator in ('deco.memoi', 'deco.lru(8)', 'deco.ttl(60)'):
+        report(f'interpreted fib(60) [{decorator}]', bench(lambda: run_ew(FIB.format(decorator=decorator, n=60)), repeat=3))
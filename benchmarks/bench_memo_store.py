@@ -0,0 +1,71 @@
+# 持久化记忆化存储的基准测试：冷启动与热启动、读写吞吐量、多进程并发写入
+
+import os
+import tempfile
+from multiprocessing import Pool
+
+# 缓存目录必须在导入core之前设置
+os.environ['EXWIDE_CACHE_DIR'] = tempfile.mkdtemp(prefix='exwide-bench-')
+
+from benchutil import bench, run_ew, report
+
+from core.MemoStore import MemoStore
+
+# 每次运行都重新定义函数，冷启动时全部计算，热启动时全部从磁盘读取
+SQUARES = '''
+import deco
+deco.persist() func slow(n) {{
+    i = 0
+    s = 0
+    while (i < 50) {{
+        s = s + n
+        i = i + 1
+    }}
+    return s
+}}
+k = 0
+while (k < {n}) {{
+    slow(k)
+    k = k + 1
+}}
+'''
+
+
+def cold_then_warm(n):
+    """清空存储后运行一次（冷），再运行一次（热）"""
+    MemoStore('slow', '').clear()
+    report(f'cold run ({n} calls)', bench(lambda: run_ew(SQUARES.format(n=n)), repeat=1))
+    report(f'warm run ({n} calls)', bench(lambda: run_ew(SQUARES.format(n=n)), repeat=1))
+
+
+def put_many(args):
+    """向存储写入n个结果，供多个进程同时调用"""
+    name, n = args
+    store = MemoStore('shared', 'body')
+    for i in range(n):
+        store.put(f'{name}-{i}', i)
+    return len(store)
+
+
+def throughput(n):
+    """单进程写入与读取n个结果"""
+    store = MemoStore('throughput', 'body')
+    store.clear()
+    report(f'put ({n})', bench(lambda: [store.put(str(i), i) for i in range(n)], repeat=1))
+    report(f'get ({n})', bench(lambda: [store.get(str(i)) for i in range(n)], repeat=1))
+
+
+def concurrent(workers, n):
+    """多个进程同时写入同一个数据库"""
+    MemoStore('shared', 'body').clear()
+    with Pool(workers) as pool:
+        ms = bench(lambda: pool.map(put_many, [(f'w{w}', n) for w in range(workers)]), repeat=1)
+    size = len(MemoStore('shared', 'body'))
+    report(f'{workers} processes x put ({n})', ms)
+    assert size == workers * n, size
+
+
+if __name__ == '__main__':
+    cold_then_warm(300)
+    throughput(2000)
+    concurrent(4, 500)
@@ -0,0 +1,52 @@
+# 内存占用的基准测试：使用tracemalloc测量大列表中每个元素的平均内存
+
+import tracemalloc
+
+import benchutil  # noqa: F401  将项目根目录加入sys.path
+
+from core.Type import EW_Boolean, EW_List, EW_Number, EW_String
+
+N = 1000000
+
+
+def measure(build, n=N):
+    """返回build(n)构造的对象平均每个元素占用的字节数"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    value = build(n)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del value
+    return used / n
+
+
+def large_ints(n):
+    """超出小整数缓存范围的整数"""
+    seven = EW_Number(7)
+    return EW_List([EW_Number(k + 1000) * seven for k in range(n)])
+
+
+def quotients(n):
+    """循环小数（Fraction）"""
+    seven = EW_Number(7)
+    return EW_List([EW_Number(k) / seven for k in range(n)])
+
+
+def decimals(n):
+    """有限小数（Decimal）"""
+    quarter = EW_Number('0.25')
+    return EW_List([EW_Number(k) * quarter for k in range(n)])
+
+
+def strings(n):
+    return EW_List([EW_String(str(k), without_quote=False) for k in range(n)])
+
+
+def booleans(n):
+    return EW_List([EW_Boolean(k % 2 == 0) for k in range(n)])
+
+
+if __name__ == '__main__':
+    for name, build in (('ints', large_ints), ('quotients', quotients), ('decimals', decimals),
+                        ('strings', strings), ('booleans', booleans)):
+        print(f'{name + f" ({N})":<40} {measure(build):>10.1f} bytes/element', flush=True)
@@ -0,0 +1,31 @@
+# 数值模式与精度的基准测试：rational/decimal/float模式以及不同Decimal精度的对比
+
+from benchutil import bench, run_ew, report
+
+from core.Type import NumericContext
+
+# 以非整数为主的吞吐型数值负载
+COMPOUND = '''
+i = 0
+x = 1.5
+s = 0
+while (i < {n}) {{
+    x = x * 1.0001 + 0.25
+    s = s + x / 3
+    i = i + 1
+}}
+'''
+
+CONFIGS = [
+    ('rational', 100),
+    ('rational', 28),
+    ('decimal', 100),
+    ('decimal', 28),
+    ('float', 100),
+]
+
+if __name__ == '__main__':
+    for mode, precision in CONFIGS:
+        numeric = NumericContext(mode, precision)
+        report(f'compound loop (3000) [{mode}, prec {precision}]',
+               bench(lambda: run_ew(COMPOUND.format(n=3000), numeric), repeat=3))
@@ -0,0 +1,41 @@
+# Exwide源码模块的基准测试：导入一个约一万行的模块，解析源码与读取AST缓存的对比
+
+import os
+import shutil
+import tempfile
+
+# 缓存目录必须在导入core之前设置
+os.environ['EXWIDE_CACHE_DIR'] = tempfile.mkdtemp(prefix='exwide-bench-')
+
+from benchutil import bench, report
+
+from core.Cache import cache_path
+from core.Module import AST_CACHE_DIR, exec_ew_module
+
+# 每个函数4行
+FUNCTION = '''func f{i}(x) {{
+    y = x * {i} + 1
+    return y - x
+}}
+'''
+
+
+def make_module(path, functions):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('// big\n')
+        for i in range(functions):
+            f.write(FUNCTION.format(i=i))
+
+
+def cold(path):
+    """删除AST缓存后导入：解析源码并写入缓存"""
+    shutil.rmtree(cache_path(AST_CACHE_DIR), ignore_errors=True)
+    exec_ew_module(path, 'big')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.ew')
+        make_module(path, 2500)
+        report('import 10k-line module, no cache', bench(lambda: cold(path), repeat=3))
+        report('import 10k-line module, cached AST', bench(lambda: exec_ew_module(path, 'big')))
@@ -0,0 +1,43 @@
+# 数字运算的基准测试：循环计数器与阶乘
+
+from benchutil import bench, run_ew, report
+
+from core.Type import EW_Number
+
+LOOP = '''
+i = 0
+while (i < {n}) {{
+    i = i + 1
+}}
+'''
+
+FACTORIAL = '''
+func fact(n) {{
+    if (n <= 1) {{ return 1 }}
+    return n * fact(n - 1)
+}}
+r = fact({n})
+'''
+
+FACTORIAL_LOOP = '''
+k = 1
+r = 1
+while (k <= {n}) {{
+    r = r * k
+    k = k + 1
+}}
+'''
+
+def number_counter(n):
+    """不经过解释器，直接测量EW_Number的自增开销"""
+    i = EW_Number(0)
+    one = EW_Number(1)
+    for _ in range(n):
+        i = i + one
+    return i
+
+if __name__ == '__main__':
+    report('EW_Number counter (100000)', bench(lambda: number_counter(100000)))
+    report('loop counter (20000)', bench(lambda: run_ew(LOOP.format(n=20000))))
+    report('recursive factorial (300)', bench(lambda: run_ew(FACTORIAL.format(n=300))))
+    report('iterative factorial (1000)', bench(lambda: run_ew(FACTORIAL_LOOP.format(n=1000))))
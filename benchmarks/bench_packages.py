@@ -0,0 +1,118 @@
+# 包加载的基准测试：包目录中的包越来越多时，启动（注册全部包）的耗时，大型包的导入耗时，
+# 以及搜索路径很多时按包名查找包文件的耗时
+
+import os
+import shutil
+import sys
+import tempfile
+
+# 即使设置了PYTHONDONTWRITEBYTECODE也写入字节码缓存，测量正常安装时的导入耗时
+sys.dont_write_bytecode = False
+
+from benchutil import bench, report
+
+from core.Package import PackageIndex, auto_load_all_packages, exec_package, packages
+
+# 每个包定义若干函数，并导入解释器的类型模块，模拟真实的包
+PACK = '''# {name}
+
+from core.Type import EW_Number
+
+packall = {{}}
+
+def pack_register(thing):
+    packall[thing.__name__] = thing
+    return thing
+''' + ''.join(f'''
+@pack_register
+def f{i}(x):
+    return x + EW_Number({i})
+''' for i in range(200))
+
+
+def make_packs(directory, n):
+    """在directory中生成n个包"""
+    for i in range(n):
+        with open(os.path.join(directory, f'pack{i}.py'), 'w', encoding='utf-8') as f:
+            f.write(PACK.format(name=f'pack{i}'))
+
+
+def startup(directory):
+    """注册目录中的全部包（惰性），启动时执行的工作"""
+    auto_load_all_packages([directory])
+
+
+def startup_eager(directory):
+    """注册并执行目录中的全部包，即原来启动时的工作"""
+    auto_load_all_packages([directory])
+    for package in packages.values():
+        package.functions
+
+
+def exec_source(file_path):
+    """原来的加载方式：每次都读取源文件并重新编译执行"""
+    module_globals = {'__file__': file_path, '__name__': 'package.big'}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        exec(f.read(), module_globals)
+
+
+def import_big(functions):
+    """导入一个含有大量函数的包：重新编译、首次导入（写入字节码缓存）与使用字节码缓存"""
+    source = PACK.split('\n@pack_register')[0].format(name='big') + ''.join(f'''
+@pack_register
+def f{i}(x):
+    return x + EW_Number({i})
+''' for i in range(functions))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        report(f'exec from source ({functions} funcs)', bench(lambda: exec_source(path)))
+        cold = lambda: (shutil.rmtree(os.path.join(directory, '__pycache__'), True), exec_package(path, 'big'))
+        report(f'importlib, no cache ({functions} funcs)', bench(cold))
+        report(f'importlib, cached ({functions} funcs)', bench(lambda: exec_package(path, 'big')))
+
+
+def probe(dirs, names):
+    """原来的查找方式：对每个搜索路径检查文件是否存在"""
+    for name in names:
+        for directory in dirs:
+            if os.path.exists(os.path.join(directory, f'{name}.py')):
+                break
+
+
+def find_all(index_path, dirs, names):
+    """新进程中的查找：读取保存的索引，每个目录stat一次，然后在内存中查找"""
+    index = PackageIndex(index_path)
+    for name in names:
+        index.find(name, dirs)
+
+
+def resolve(n_dirs, per_dir):
+    """n_dirs个搜索路径，每个目录per_dir个包，查找全部包"""
+    with tempfile.TemporaryDirectory() as root:
+        dirs = []
+        for d in range(n_dirs):
+            directory = os.path.join(root, f'dir{d}')
+            os.mkdir(directory)
+            for i in range(per_dir):
+                with open(os.path.join(directory, f'p{d}_{i}.py'), 'w', encoding='utf-8') as f:
+                    f.write(f'# p{d}_{i}\npackall = {{}}\n')
+            dirs.append(directory)
+        names = [f'p{d}_{i}' for d in range(n_dirs) for i in range(per_dir)]
+        index_path = os.path.join(root, 'index.json')
+        report(f'probe exists ({n_dirs} dirs, {len(names)} names)', bench(lambda: probe(dirs, names)))
+        report(f'index, first scan ({n_dirs} dirs)', bench(lambda: find_all(index_path, dirs, names), repeat=1))
+        report(f'index, warm ({n_dirs} dirs)', bench(lambda: find_all(index_path, dirs, names)))
+
+
+if __name__ == '__main__':
+    resolve(50, 10)
+    for functions in (1000, 10000):
+        import_big(functions)
+    for n in (0, 10, 50, 200):
+        with tempfile.TemporaryDirectory() as directory:
+            make_packs(directory, n)
+            report(f'lazy startup ({n} packs)', bench(lambda: startup(directory)))
+            report(f'eager startup ({n} packs)', bench(lambda: startup_eager(directory), repeat=1))
+        packages.clear()
@@ -0,0 +1,53 @@
+# 除法密集型负载的基准测试：精确有理数与Decimal近似计算的对比
+
+from benchutil import bench, run_ew, report
+
+from core.Type import EW_Number, NumericContext
+
+# 反复除以小整数再乘回来，有理数的分母保持很小
+SCALE = '''
+i = 1
+x = 1
+while (i < {n}) {{
+    x = x / 7
+    x = x * 7
+    i = i + 1
+}}
+'''
+
+# 调和级数，有理数的分母随项数增长
+HARMONIC = '''
+i = 1
+h = 0
+while (i <= {n}) {{
+    h = h + 1 / i
+    i = i + 1
+}}
+'''
+
+
+def quotients_repr(n):
+    """构造并输出n个商，测量循环小数的渲染开销"""
+    for k in range(1, n + 1):
+        repr(EW_Number(k) / EW_Number(7))
+
+
+def run_modes(name, func):
+    """分别在有理数模式与Decimal模式下运行同一负载"""
+    for mode in ('rational', 'decimal'):
+        numeric = NumericContext(mode)
+        report(f'{name} [{mode}]', bench(lambda: func(numeric)))
+
+
+def in_context(func):
+    """在给定的数值运算环境中调用func"""
+    def wrapper(numeric):
+        with numeric:
+            return func()
+    return wrapper
+
+
+if __name__ == '__main__':
+    run_modes('divide/multiply by 7 (2000)', lambda numeric: run_ew(SCALE.format(n=2000), numeric))
+    run_modes('harmonic sum (200)', lambda numeric: run_ew(HARMONIC.format(n=200), numeric))
+    run_modes('repr of k/7 (20000)', in_context(lambda: quotients_repr(20000)))
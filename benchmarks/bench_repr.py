@@ -0,0 +1,31 @@
+# 数字输出的基准测试：打印包含大量计算结果的列表
+
+from benchutil import bench, report
+
+from core.Type import EW_List, EW_Number, NumericContext
+
+N = 100000
+
+
+def computed_list(n):
+    """构造n个计算得到的数字：整数、循环小数与有限小数交替出现"""
+    seven = EW_Number(7)
+    quarter = EW_Number('0.25')
+    items = []
+    for k in range(1, n + 1):
+        number = EW_Number(k)
+        items.append(number * seven)
+        items.append(number / seven)
+        items.append(number * quarter)
+    return EW_List(items[:n])
+
+
+if __name__ == '__main__':
+    for mode in ('rational', 'decimal'):
+        with NumericContext(mode):
+            # 每轮重新构造列表，测量首次输出的开销
+            lists = [computed_list(N) for _ in range(3)]
+            report(f'repr list, first ({N}) [{mode}]', bench(lambda: repr(lists.pop()), repeat=3))
+            numbers = computed_list(N)
+            repr(numbers)
+            report(f'repr list, repeated ({N}) [{mode}]', bench(lambda: repr(numbers), repeat=3))
@@ -0,0 +1,112 @@
+# 脚本执行服务器的基准测试：与每次启动新进程（python main.py script.ew）相比的单个请求延迟，
+# 以及多个客户端并发提交时的吞吐量
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchutil import parent_dir, report
+
+from core.Client import request
+
+MAIN = os.path.join(parent_dir, 'main.py')
+
+# 使用包并做少量计算，代表一个典型的短脚本
+SMALL = '''import list
+s = 0
+i = 0
+while (i < 200) {
+    s = s + i
+    i = i + 1
+}
+print(s)
+'''
+
+# 定义大量函数的脚本，新进程每次都要重新解析，服务器直接使用缓存的AST
+LARGE = ''.join(f'func f{i}(x) {{\n    y = x + {i}\n    return y * 2\n}}\n' for i in range(300)) + SMALL
+
+
+def environment():
+    """子进程的环境：允许写入字节码缓存（与正常安装一致），日志关闭"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env.pop('EXWIDE_LOG', None)
+    return env
+
+
+def start_server(address, workers):
+    """启动服务器进程，等到可以连接时返回"""
+    server = subprocess.Popen([sys.executable, MAIN, '--serve', address, '--workers', str(workers)],
+                              env=environment(), stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(address)
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError('server did not start')
+
+
+def latency(func, runs=20):
+    """多次运行，返回最短与中位耗时（毫秒）"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def throughput(func, total, clients):
+    """clients个客户端并发完成total次请求，返回每秒完成的请求数"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(lambda _: func(), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def scenario(name, code, directory, address, clients):
+    """同一个脚本分别在新进程中运行、通过main.py --connect与直接通过套接字提交"""
+    script = os.path.join(directory, f'{name}.ew')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write(code)
+
+    def cold():
+        subprocess.run([sys.executable, MAIN, script], env=environment(), check=True, stdout=subprocess.DEVNULL)
+
+    def client():
+        subprocess.run([sys.executable, MAIN, '--connect', address, script], env=environment(), check=True,
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+
+    def direct():
+        response = request(address, {'code': code})
+        assert response['status'] == 'ok', response
+
+    cold()
+    for label, func in (('cold python main.py', cold), ('main.py --connect', client), ('socket request', direct)):
+        best, median = latency(func)
+        report(f'{name}: {label} (best)', best)
+        report(f'{name}: {label} (median)', median)
+    for label, func, total in (('cold python main.py', cold, 40), ('socket request', direct, 400)):
+        print(f'{name + ": " + label:<40} {throughput(func, total, clients):>10.1f} req/s ({clients} clients)')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, 'exwide.sock')
+        workers = os.cpu_count() or 4
+        server = start_server(address, workers)
+        try:
+            for name, code in (('small', SMALL), ('large', LARGE)):
+                scenario(name, code, directory, address, workers * 2)
+        finally:
+            server.terminate()
+            server.wait()
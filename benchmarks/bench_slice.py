@@ -0,0 +1,39 @@
+# 列表切片的基准测试：共享存储的视图与复制的对比
+
+from benchutil import bench, report
+
+from core.Type import EW_List, EW_Number
+
+
+def halve(xs, take):
+    """像二分查找一样不断取一半，直到只剩一个元素"""
+    while len(xs) > 1:
+        xs = take(xs, len(xs) // 2)
+    return xs
+
+
+def by_view(xs, n):
+    return xs.slice(n, len(xs))
+
+
+def by_copy(xs, n):
+    return EW_List(xs.to_list()[n:])
+
+
+def split_all(xs):
+    """像归并排序一样递归地二分整个列表"""
+    if len(xs) <= 1:
+        return
+    mid = len(xs) // 2
+    split_all(xs.slice(0, mid))
+    split_all(xs.slice(mid, len(xs)))
+
+
+if __name__ == '__main__':
+    for n in (10000, 100000, 1000000):
+        xs = EW_List([EW_Number(k) for k in range(n)])
+        report(f'halving by view ({n})', bench(lambda: halve(xs, by_view)))
+        report(f'halving by copy ({n})', bench(lambda: halve(xs, by_copy)))
+    for n in (10000, 100000):
+        xs = EW_List([EW_Number(k) for k in range(n)])
+        report(f'mergesort split by view ({n})', bench(lambda: split_all(xs), repeat=3))
@@ -0,0 +1,83 @@
+# 解释器状态快照的基准测试：重新执行前置代码（定义大量函数并填充记忆化缓存）与读取快照的耗时，
+# 分别在同一进程中与新进程中（main.py --from-snapshot）测量
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchutil import bench, parent_dir, report
+
+from core.Env import Env
+from core.Parser import GENV, directly_run
+from core.Snapshot import load_snapshot, save_snapshot
+
+MAIN = os.path.join(parent_dir, 'main.py')
+
+
+def prelude(functions, memo):
+    """定义functions个函数，并让记忆化函数缓存memo个结果"""
+    lines = [f'func f{i}(x) {{\n    y = x + {i}\n    return y * 2\n}}' for i in range(functions)]
+    lines.append('''mfunc tri(n) {
+    i = 0
+    s = 0
+    while (i < n) {
+        s = s + i
+        i = i + 1
+    }
+    return s
+}''')
+    lines.append(f'k = 0\nwhile (k < {memo}) {{\n    tri(k)\n    k = k + 1\n}}')
+    return '\n'.join(lines) + '\n'
+
+
+def fresh_env():
+    return Env(**GENV.vals)
+
+
+def in_process(code, path):
+    """同一进程中：执行前置代码，与读取执行后保存的快照"""
+    env = fresh_env()
+    directly_run(code, env=env)
+    save_snapshot(path, env)
+    report('run prelude', bench(lambda: directly_run(code, env=fresh_env()), repeat=3))
+    report('load snapshot', bench(lambda: load_snapshot(path), repeat=3))
+
+
+def best_of(argv, runs=5):
+    """多次在新进程中运行，返回最短耗时（毫秒）"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN, *argv], env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def cold_process(code, directory):
+    """新进程中：先执行前置代码再运行脚本，与从快照启动后运行脚本"""
+    script = os.path.join(directory, 'main.ew')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write('print(f0(tri(10)))\n')
+    full = os.path.join(directory, 'full.ew')
+    with open(full, 'w', encoding='utf-8') as f:
+        f.write(code + 'print(f0(tri(10)))\n')
+    prelude_file = os.path.join(directory, 'prelude.ew')
+    with open(prelude_file, 'w', encoding='utf-8') as f:
+        f.write(code)
+    snapshot = os.path.join(directory, 'prelude.snap')
+    best_of(['--snapshot', snapshot, prelude_file], runs=1)
+    report('process: prelude + script', best_of([full]))
+    report('process: --from-snapshot', best_of(['--from-snapshot', snapshot, script]))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        for functions, memo in ((100, 100), (1000, 300)):
+            code = prelude(functions, memo)
+            print(f'{functions} functions, {memo} cached results')
+            in_process(code, os.path.join(directory, f'{functions}.snap'))
+            cold_process(code, directory)
@@ -0,0 +1,68 @@
+# 启动时间的基准测试：新进程运行一个几乎为空的脚本的耗时，以及按模块统计的导入耗时（python -X importtime）
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchutil import parent_dir, report
+
+MAIN = os.path.join(parent_dir, 'main.py')
+
+
+def environment():
+    """子进程的环境：允许写入字节码缓存（与正常安装一致），日志关闭"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env.pop('EXWIDE_LOG', None)
+    return env
+
+
+def cold_start(script, runs=20):
+    """多次在新进程中运行脚本，返回最短耗时（毫秒）"""
+    env = environment()
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN, script], env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def python_start(runs=20):
+    """空的Python进程的启动耗时，作为参照"""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], env=environment(), check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_report(script, top=15):
+    """打印导入耗时最多的模块（自身耗时，微秒），格式与 -X importtime 相同"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', MAIN, script], env=environment(),
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    total = sum(row[0] for row in rows)
+    print(f'imports: {len(rows)} modules, {total / 1000:.2f} ms')
+    for self_us, cumulative_us, name in sorted(rows, reverse=True)[:top]:
+        print(f'{self_us:>10} | {cumulative_us:>10} | {name}')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, 'empty.ew')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write('x = 1\n')
+        # 第一次运行写入字节码缓存与包索引
+        cold_start(script, runs=1)
+        report('python -c pass', python_start())
+        report('main.py empty script', cold_start(script))
+        import_report(script)
@@ -0,0 +1,72 @@
+# Table的基准测试：以连续整数为键的读写与内存占用
+
+import tracemalloc
+
+from benchutil import bench, run_ew, report
+
+from core.Type import EW_Number, EW_String, EW_Table
+
+N = 1000000
+
+FILL_LOOP = '''
+t = {{}}
+i = 0
+while (i < {n}) {{
+    t[i] = i
+    i = i + 1
+}}
+'''
+
+
+def fill(n):
+    """以0..n-1为键依次写入"""
+    table = EW_Table()
+    for k in range(n):
+        key = EW_Number(k)
+        table[key] = key
+    return table
+
+
+def fill_reversed(n):
+    """以n-1..0的顺序写入，键先进入哈希部分再整体迁移"""
+    table = EW_Table()
+    for k in range(n - 1, -1, -1):
+        key = EW_Number(k)
+        table[key] = key
+    return table
+
+
+def read_all(table, keys):
+    for key in keys:
+        table[key]
+
+
+def bytes_per_entry(build, n=N):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    table = build(n)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del table
+    return used / n
+
+
+def string_keyed(n):
+    table = EW_Table()
+    for k in range(n):
+        table[EW_String(str(k), without_quote=False)] = EW_Number(k)
+    return table
+
+
+if __name__ == '__main__':
+    report(f'fill integer keys ({N})', bench(lambda: fill(N), repeat=3))
+    report(f'fill integer keys reversed ({N})', bench(lambda: fill_reversed(N), repeat=3))
+    table = fill(N)
+    keys = [EW_Number(k) for k in range(N)]
+    report(f'read integer keys ({N})', bench(lambda: read_all(table, keys), repeat=3))
+    strings = string_keyed(N)
+    string_keys = [EW_String(str(k), without_quote=False) for k in range(N)]
+    report(f'read string keys ({N})', bench(lambda: read_all(strings, string_keys), repeat=3))
+    report('interpreted fill loop (1000)', bench(lambda: run_ew(FILL_LOOP.format(n=1000)), repeat=3))
+    print(f'{"integer-keyed memory":<40} {bytes_per_entry(fill):>10.1f} bytes/entry')
+    print(f'{"string-keyed memory":<40} {bytes_per_entry(string_keyed):>10.1f} bytes/entry')
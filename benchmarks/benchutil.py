@@ -0,0 +1,46 @@
+# 基准测试的公共工具
+
+import os
+import sys
+import time
+
+# 获取当前文件所在目录的父目录（即项目根目录）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)  # 项目根目录
+
+# 将项目根目录添加到系统路径，保证可以导入core包
+sys.path.insert(0, parent_dir)
+
+
+def bench(func, repeat=5):
+    """多次运行func，返回最短耗时（毫秒）
+
+    Args:
+        func: 无参数的可调用对象
+        repeat: 重复次数
+
+    Returns:
+        float: 最短一次运行的耗时，单位毫秒
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_ew(code, numeric=None):
+    """解析并执行一段Exwide代码，返回执行结果
+
+    Args:
+        code: Exwide代码
+        numeric: 可选的数值运算环境（core.Type.NumericContext）
+    """
+    from core.Parser import directly_run
+    return directly_run(code, numeric)
+
+
+def report(name, ms):
+    """打印一行基准测试结果"""
+    print(f'{name:<40} {ms:>10.2f} ms', flush=True)
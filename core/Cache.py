@@ -0,0 +1,36 @@
+import os
+
+# 缓存目录的环境变量，未设置时使用 ~/.cache/exwide
+CACHE_DIR_ENV = 'EXWIDE_CACHE_DIR'
+
+
+def cache_dir() -> str:
+    """返回Exwide的缓存目录，不存在时自动创建"""
+    path = os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser('~'), '.cache', 'exwide')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(name: str) -> str:
+    """返回缓存目录中指定文件的路径
+
+    Args:
+        name: 文件名
+    """
+    return os.path.join(cache_dir(), name)
+
+
+# 持久化缓存的命名空间：通常为正在运行的脚本的绝对路径，不同脚本中同名的函数互不影响
+DEFAULT_NAMESPACE = '<main>'
+_namespace = DEFAULT_NAMESPACE
+
+
+def set_cache_namespace(name: str) -> None:
+    """设置持久化缓存的命名空间（main.py运行脚本前设为脚本的绝对路径）"""
+    global _namespace
+    _namespace = name
+
+
+def cache_namespace() -> str:
+    """返回持久化缓存当前的命名空间"""
+    return _namespace
@@ -0,0 +1,76 @@
+import json
+import socket
+import struct
+
+# 脚本执行服务器（core.Server）的通信协议与客户端，只导入很少的标准库模块（不导入typing与解释器），客户端进程启动很快
+#
+# 消息格式：4字节大端长度 + UTF-8编码的JSON对象。
+# 请求：{"code": 源码}，可选 "stdin"、"timeout"（秒）、"numeric"、"precision"
+# 响应：{"status": "ok" | "error" | "timeout", "stdout": 输出, "result": 最后一条语句的值, "error": 错误信息}
+
+_HEADER = struct.Struct('>I')
+
+# TCP只允许本机回环地址：服务器没有身份验证，不能对其他主机开放
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+class ServerError(Exception):
+    """与服务器通信失败，或收到无法识别的消息"""
+
+
+def parse_address(address: str) -> tuple:
+    """解析服务器地址：'host:port' 或 ':port' 为本机回环地址上的TCP端口（默认127.0.0.1），其他为Unix套接字路径
+
+    Raises:
+        ValueError: TCP地址的主机不是本机回环地址
+    """
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        host = host.strip('[]') or '127.0.0.1'
+        if host not in LOOPBACK_HOSTS:
+            raise ValueError(f'Only loopback addresses are allowed ({", ".join(LOOPBACK_HOSTS)}), got {host}')
+        if host == '::1':
+            return socket.AF_INET6, (host, int(port))
+        return socket.AF_INET, ('127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ServerError('Connection closed before the message was complete')
+        data += chunk
+    return bytes(data)
+
+
+def send_message(sock: socket.socket, message: dict) -> None:
+    """发送一条消息"""
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock: socket.socket) -> dict:
+    """接收一条消息
+
+    Raises:
+        ServerError: 连接中断，或消息不是JSON对象
+    """
+    size, = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    try:
+        message = json.loads(_recv_exact(sock, size))
+    except ValueError as e:
+        raise ServerError(f'Malformed message: {e}') from None
+    if not isinstance(message, dict):
+        raise ServerError('Malformed message: expected an object')
+    return message
+
+
+def request(address: str, message: dict) -> dict:
+    """向服务器提交一个请求并等待响应"""
+    family, addr = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(addr)
+        send_message(sock, message)
+        return recv_message(sock)
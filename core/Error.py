@@ -1,16 +1,13 @@
-from time import sleep, strftime, localtime
-
-LOG = 0
+from core.Log import Lazy, get_logger
 
 # 全局调用栈，用于跟踪函数调用，每个元素是包含函数名和上下文信息的字典
 execution_stack = []
 
-def clog(msg):
-    timenow = strftime('%H:%M:%S', localtime())
-    if LOG:
-        #sleep(.05)
-        print(f'[DEBUG OUTPUT {timenow}] {msg}\n', flush = True)
-    # write_file('debug.log', f'[DEBUG OUTPUT {timenow}] {msg}\n')
+_log = get_logger('core')
+
+def clog(msg, *args):
+    """记录core分类的DEBUG日志，新代码请使用core.Log.get_logger获取分类的记录器"""
+    _log.debug(msg, *args)
 
 def push_stack(function_name, line=None, code=None):
     """
@@ -51,7 +48,7 @@ class EW_RUNTIME_ERROR(EW_ERROR):
     pass
 
 def raise_err(err, msg, line=None, code=None, pos=None):
-    clog(f'raise_err({err.__name__!r}, {msg!r}, {line!r}, {code!r}, {pos!r})')
+    _log.debug('raise_err(%r, %r, %r, %r, %r)', err.__name__, msg, line, code, pos)
     """
     抛出错误并显示友好的错误信息
     
@@ -215,4 +212,4 @@ def ld_show(data, indent=0, is_last=True, is_root=True):
 
 if __name__ == '__main__':
     print(ld_show({'a': 1, 'b': 2, 'c': {'d': 3, 'e': 4}}))
-    clog('DOING')
\ No newline at end of file
+    clog('DOING %s', Lazy(ld_show, [1, 2]))
\ No newline at end of file
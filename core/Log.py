@@ -0,0 +1,203 @@
+from collections import deque
+import os
+from time import localtime, strftime
+from typing import Any, Callable
+
+# 分级、分类的调试日志
+#
+# 每个模块通过get_logger(分类)获得一个Logger，用 %-格式 的消息与参数记录日志：
+#     _log = get_logger('parser')
+#     _log.debug('赋值: %s = %s', name, value)
+# 日志关闭时只比较一次级别就返回，消息不会被格式化，时间也不会被读取。
+# 代价较高的参数（例如ld_show整个AST）用Lazy包装，只有真正输出时才求值。
+#
+# 默认关闭全部日志，可以通过环境变量或configure_logging()打开：
+#     EXWIDE_LOG=debug                   所有分类输出DEBUG及以上级别
+#     EXWIDE_LOG=info,parser=debug       默认INFO，parser分类输出DEBUG
+#     EXWIDE_LOG_FILE=debug.log          写入文件而不是标准输出
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+_LEVEL_TAGS = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+LOG_ENV = 'EXWIDE_LOG'
+LOG_FILE_ENV = 'EXWIDE_LOG_FILE'
+
+
+class Lazy:
+    """延迟求值的日志参数，日志输出时才调用func(*args)"""
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func: Callable, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+
+def stdout_sink(line: str) -> None:
+    """默认的输出：打印到标准输出"""
+    print(line, flush=True)
+
+
+class FileSink:
+    """将日志追加写入文件"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='UTF-8')
+
+    def __call__(self, line: str) -> None:
+        self._file.write(line + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RingBuffer:
+    """只保留最近capacity条日志的内存缓冲区，适合在出错后查看最近的执行过程"""
+
+    def __init__(self, capacity: int = 1000):
+        self.lines = deque(maxlen=capacity)
+
+    def __call__(self, line: str) -> None:
+        self.lines.append(line)
+
+    def dump(self) -> str:
+        return '\n'.join(self.lines)
+
+    def clear(self) -> None:
+        self.lines.clear()
+
+
+class Logger:
+    """一个分类的日志记录器，级别低于阈值的日志直接丢弃"""
+
+    __slots__ = ('category', 'level')
+
+    def __init__(self, category: str, level: int):
+        self.category = category
+        self.level = level
+
+    def enabled(self, level: int = DEBUG) -> bool:
+        """该级别的日志是否会被输出，用于跳过只为日志准备数据的代码"""
+        return level >= self.level
+
+    def log(self, level: int, msg: str, *args: Any) -> None:
+        if level >= self.level:
+            _emit(self.category, level, msg, args)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        if self.level <= DEBUG:
+            _emit(self.category, DEBUG, msg, args)
+
+    def info(self, msg: str, *args: Any) -> None:
+        if self.level <= INFO:
+            _emit(self.category, INFO, msg, args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        if self.level <= WARNING:
+            _emit(self.category, WARNING, msg, args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        if self.level <= ERROR:
+            _emit(self.category, ERROR, msg, args)
+
+    def __repr__(self):
+        return f'<logger {self.category} level {self.level}>'
+
+
+_loggers: dict[str, Logger] = {}
+_default_level = OFF
+_category_levels: dict[str, int] = {}
+_sink: Callable[[str], None] = stdout_sink
+
+
+def _emit(category: str, level: int, msg: str, args: tuple) -> None:
+    text = msg % args if args else msg
+    _sink(f'[{_LEVEL_TAGS.get(level, level)} {category} {strftime("%H:%M:%S", localtime())}] {text}')
+
+
+def get_logger(category: str) -> Logger:
+    """获取分类的日志记录器，同一分类总是返回同一个对象"""
+    logger = _loggers.get(category)
+    if logger is None:
+        logger = _loggers[category] = Logger(category, _category_levels.get(category, _default_level))
+    return logger
+
+
+def _level(value: int | str) -> int:
+    if isinstance(value, int):
+        return value
+    try:
+        return LEVELS[value.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level {value!r}, expected one of {', '.join(LEVELS)}") from None
+
+
+def configure_logging(level: int | str | None = None,
+                      categories: dict[str, int | str] | None = None,
+                      sink: Callable[[str], None] | None = None) -> None:
+    """修改日志配置，已经创建的Logger立即生效
+
+    Args:
+        level: 默认级别，未单独设置的分类使用该级别
+        categories: 各分类的级别
+        sink: 日志输出，接受一行文本的可调用对象（stdout_sink、FileSink、RingBuffer等）
+
+    Raises:
+        ValueError: 级别名称无效
+    """
+    global _default_level, _sink
+    if level is not None:
+        _default_level = _level(level)
+    if categories:
+        _category_levels.update({name: _level(value) for name, value in categories.items()})
+    if sink is not None:
+        _sink = sink
+    for name, logger in _loggers.items():
+        logger.level = _category_levels.get(name, _default_level)
+
+
+def parse_log_spec(spec: str) -> tuple[int | None, dict[str, int]]:
+    """解析"info,parser=debug"形式的日志配置，返回(默认级别, 各分类级别)
+
+    Raises:
+        ValueError: 级别名称无效
+    """
+    level = None
+    categories = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        if '=' in part:
+            name, value = part.split('=', 1)
+            categories[name.strip()] = _level(value)
+        else:
+            level = _level(part)
+    return level, categories
+
+
+def configure_from_env() -> None:
+    """按环境变量EXWIDE_LOG与EXWIDE_LOG_FILE配置日志"""
+    spec = os.environ.get(LOG_ENV)
+    path = os.environ.get(LOG_FILE_ENV)
+    if spec:
+        level, categories = parse_log_spec(spec)
+        configure_logging(level, categories)
+    if path:
+        configure_logging(sink=FileSink(path))
+
+
+try:
+    configure_from_env()
+except ValueError as e:
+    print(f'{LOG_ENV}: {e}')
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import time
+from typing import Any
+from core.Type import EW_Boolean, EW_List, EW_Number, EW_String, EW_Table, table_key
+
+# 记忆化函数使用的缓存键
+#
+# 数字、字符串与布尔值直接使用table_key()得到的原生键；
+# List与Table被“冻结”为可哈希的指纹（带类型标记的元组），
+# 指纹缓存在容器的_fingerprint上，容器被修改时清除。
+# 嵌套容器的指纹同时记录各子容器及其指纹，子容器的指纹对象未变时才复用，
+# 因此复用一个指纹只需检查其中的子容器，而不必遍历全部元素。
+
+# 可以直接转换为原生键的值类型
+_LEAF_TYPES = (EW_Number, EW_String, EW_Boolean, type(None))
+
+
+class Unfingerprintable(Exception):
+    """参数无法转换为缓存键（如函数、包或包含自身的容器）"""
+
+
+def memo_key(args: list[Any]) -> tuple | None:
+    """生成记忆化函数调用的缓存键
+
+    Args:
+        args: 调用参数列表
+
+    Returns:
+        tuple: 可哈希的缓存键；若有参数无法转换，返回None，调用时不使用缓存
+    """
+    try:
+        return tuple(fingerprint(arg) for arg in args)
+    except Unfingerprintable:
+        return None
+
+
+def detach(value: Any) -> Any:
+    """返回可以安全存入或取出缓存的值：List与Table取写时复制的快照，其余值不可变，直接返回"""
+    if isinstance(value, (EW_List, EW_Table)):
+        return value.snapshot()
+    return value
+
+
+def fingerprint(value: Any, active: frozenset = frozenset()) -> Any:
+    """将值转换为可哈希的结构化指纹
+
+    Args:
+        value: 要转换的值
+        active: 正在转换中的容器的id，用于检测包含自身的容器
+
+    Raises:
+        Unfingerprintable: 值无法转换为指纹
+    """
+    if isinstance(value, _LEAF_TYPES):
+        return table_key(value)
+    if not isinstance(value, (EW_List, EW_Table)):
+        raise Unfingerprintable(type(value).__name__)
+    if id(value) in active:
+        raise Unfingerprintable('recursive container')
+
+    cached = value._fingerprint
+    active = active | {id(value)}
+
+    # 缓存的指纹仍然有效：自身未被修改（修改时会清除缓存），且每个子容器的指纹对象都没有变化
+    if cached is not None:
+        result, children = cached
+        if all(fingerprint(child, active) is child_key for child, child_key in children):
+            return result
+
+    if isinstance(value, EW_List):
+        items = list(value._elements())
+        result = (EW_List, tuple(fingerprint(item, active) for item in items))
+    else:
+        items = [*value._array, *value._hash.values()]
+        array = tuple(fingerprint(item, active) for item in value._array)
+        hash_part = frozenset((key, fingerprint(item, active)) for key, item in value._hash.items())
+        result = (EW_Table, array, hash_part)
+
+    # 子容器的指纹此时已经缓存，再次获取不会重新计算
+    children = tuple((item, fingerprint(item, active)) for item in items
+                     if isinstance(item, (EW_List, EW_Table)))
+    value._fingerprint = (result, children)
+    return result
+
+
+# 缓存中不存在的键
+MISSING = object()
+
+
+class MemoCache:
+    """记忆化函数的结果缓存，支持容量上限（LRU淘汰）、过期时间（TTL）与命中统计
+
+    不设置容量与过期时间时等同于普通字典，查找没有额外开销。
+    """
+
+    def __init__(self, maxsize: int | None = None, ttl: float | None = None):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的结果个数，None表示不限制
+            ttl: 结果的有效时间（秒），None表示永不过期
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"Cache TTL must be positive, got {ttl}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # 设置TTL时存放(结果, 过期时刻)，否则直接存放结果
+        self._data = OrderedDict() if maxsize is not None else {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0    # 因容量上限被淘汰的结果数
+        self.expirations = 0  # 因过期被移除的结果数
+
+    def get(self, key: tuple) -> Any:
+        """查找缓存的结果，不存在或已过期时返回MISSING"""
+        value = self._lookup(key)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _lookup(self, key: tuple) -> Any:
+        """在内存中查找结果，不计入命中统计"""
+        entry = self._data.get(key, MISSING)
+        if entry is MISSING:
+            return MISSING
+        if self.ttl is not None:
+            value, expires = entry
+            if time.monotonic() >= expires:
+                del self._data[key]
+                self.expirations += 1
+                return MISSING
+            entry = value
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, value: Any) -> None:
+        """缓存结果，超出容量时淘汰最久未使用的结果"""
+        data = self._data
+        if self.ttl is not None:
+            value = (value, time.monotonic() + self.ttl)
+        data[key] = value
+        if self.maxsize is not None:
+            data.move_to_end(key)
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存的结果，统计数据保留"""
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """返回缓存的统计数据"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f'<memo cache size {len(self._data)}, maxsize {self.maxsize}, ttl {self.ttl}>'
@@ -0,0 +1,334 @@
+from contextlib import contextmanager
+from decimal import Decimal
+from fractions import Fraction
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any
+from core.Cache import cache_namespace, cache_path
+from core.Env import Env
+from core.Memo import MISSING, MemoCache, Unfingerprintable, fingerprint
+from core.Type import EW_Boolean, EW_Function, EW_MFunction, EW_Number, EW_String, table_key
+
+# 记忆化函数的持久化存储（deco.persist），与core.Memo分开，不使用时不必导入sqlite3等模块
+#
+# 持久化存储：SQLite数据库，多个解释器进程可以同时读写（WAL模式）
+MEMO_DB = 'memo.sqlite3'
+SCHEMA_VERSION = 2  # 表结构改变时递增，打开旧版本的数据库时丢弃其中的结果
+
+# fork之前打开的、子进程中不再使用的数据库连接：SQLite连接不能跨fork使用，
+# 在子进程中关闭也可能影响父进程持有的锁，只保留引用直到进程结束
+_INHERITED_CONNECTIONS: list[sqlite3.Connection] = []
+
+# 计算函数体哈希时忽略的AST字段：位置信息与成员访问处的缓存不影响函数的行为
+_IGNORED_KEYS = frozenset(('line', 'col', 'code', 'site'))
+
+
+def canonical(value: Any) -> str:
+    """将缓存键或AST转换为确定的文本表示，不依赖哈希随机化与插入顺序
+
+    Raises:
+        Unfingerprintable: 值无法转换
+    """
+    if value is None or isinstance(value, bool):
+        return repr(value)
+    if isinstance(value, int):
+        return f'i{value}'
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, Fraction):
+        return f'q{value.numerator}/{value.denominator}'
+    if isinstance(value, (Decimal, float)):
+        return f'd{value}' if isinstance(value, Decimal) else f'f{value!r}'
+    if isinstance(value, EW_Boolean):
+        # table_key()对布尔值返回单例本身，不能再递归转换
+        return 'b1' if value.value else 'b0'
+    if isinstance(value, (EW_Number, EW_String)):
+        return f'{type(value).__name__}:{canonical(table_key(value))}'
+    if isinstance(value, type):
+        return f'type:{value.__qualname__}'
+    if isinstance(value, dict):
+        items = (f'{canonical(k)}:{canonical(v)}' for k, v in sorted(value.items()) if k not in _IGNORED_KEYS)
+        return '{' + ','.join(items) + '}'
+    if isinstance(value, (list, tuple)):
+        return '(' + ','.join(canonical(item) for item in value) + ')'
+    if isinstance(value, frozenset):
+        return 'set(' + ','.join(sorted(canonical(item) for item in value)) + ')'
+    raise Unfingerprintable(type(value).__name__)
+
+
+def function_hash(func: EW_MFunction) -> str:
+    """计算函数参数与函数体的哈希，函数体改变时哈希随之改变"""
+    return _function_info(func)[1]
+
+
+# 函数体 -> (函数体, 哈希, 读取的全局变量名)；保存函数体本身，保证id不会被复用
+_FUNCTION_INFO: dict[int, tuple[list, str, tuple[str, ...]]] = {}
+
+
+def _function_info(func: EW_Function | EW_MFunction) -> tuple[list, str, tuple[str, ...]]:
+    info = _FUNCTION_INFO.get(id(func.body))
+    if info is None:
+        text = canonical((tuple(func.params), func.body))
+        names = set()
+        _collect_refs(func.body, names)
+        info = (func.body, hashlib.sha256(text.encode('utf-8')).hexdigest(),
+                tuple(sorted(names.difference(func.params))))
+        _FUNCTION_INFO[id(func.body)] = info
+    return info
+
+
+def _collect_refs(node: Any, names: set[str]) -> None:
+    """收集AST中引用的全部变量名"""
+    if isinstance(node, dict):
+        if node.get('kind') == 'VarRef':
+            names.add(node['name'])
+        for key, value in node.items():
+            if key not in _IGNORED_KEYS:
+                _collect_refs(value, names)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_refs(item, names)
+
+
+def free_globals(func: EW_Function | EW_MFunction) -> tuple[str, ...]:
+    """函数体读取的、不是参数的变量名（排序后）"""
+    return _function_info(func)[2]
+
+
+def globals_key(names: tuple[str, ...], env: Env, active: frozenset = frozenset()) -> tuple:
+    """函数体读取的全局变量当前的值，作为持久化缓存键的一部分
+
+    内置函数与包按名称（及包文件路径）表示，用户函数按函数体哈希及其读取的全局变量递归表示，
+    其余值使用记忆化缓存的指纹。
+
+    Args:
+        names: 变量名（见free_globals）
+        env: 函数定义时的全局环境
+        active: 正在计算中的函数体的id，递归引用的函数只记录函数体哈希
+
+    Raises:
+        Unfingerprintable: 有全局变量的值无法表示，这次调用不使用缓存
+    """
+    from core.Package import EW_Package
+    from core.ew_builtins import EW_builtins
+    values = env.vals
+    parts = []
+    for name in names:
+        value = values.get(name, MISSING)
+        if value is MISSING:
+            part = ('missing',)
+        elif isinstance(value, EW_builtins):
+            part = ('builtin', value.func.__name__)
+        elif isinstance(value, EW_Package):
+            part = ('package', value.name, value.path)
+        elif isinstance(value, (EW_Function, EW_MFunction)):
+            body, body_hash, refs = _function_info(value)
+            if id(body) in active:
+                part = ('function', body_hash)
+            else:
+                part = ('function', body_hash, globals_key(refs, value.env, active | {id(body)}))
+        else:
+            part = ('value', fingerprint(value))
+        parts.append((name, part))
+    return tuple(parts)
+
+
+class MemoStore:
+    """一个记忆化函数在SQLite数据库中的持久化结果
+
+    按(命名空间, 函数名, 函数体哈希, 键哈希)存放pickle序列化的结果。打开时删除同一命名空间中
+    同名函数旧版本函数体的结果；设置maxsize时只保留最近使用的maxsize个结果。
+    写入在BEGIN IMMEDIATE事务中完成，并设置等待超时，多个进程可以安全地并发访问。
+    数据库连接属于打开它的进程，fork出的子进程（例如脚本服务器的工作进程）第一次访问时重新打开。
+    """
+
+    def __init__(self, name: str, body_hash: str, maxsize: int | None = None, path: str | None = None,
+                 namespace: str | None = None):
+        """打开持久化存储
+
+        Args:
+            name: 函数名
+            body_hash: 函数体哈希（见function_hash）
+            maxsize: 最多保存的结果个数，None表示不限制
+            path: 数据库文件路径，默认为缓存目录下的MEMO_DB
+            namespace: 命名空间，默认为当前的cache_namespace()（正在运行的脚本）
+        """
+        self.name = name
+        self.body_hash = body_hash
+        self.maxsize = maxsize
+        self.path = path or cache_path(MEMO_DB)
+        self.namespace = namespace or cache_namespace()
+        self._scope = (self.namespace, name, body_hash)
+        self._connection = None
+        self._pid = None
+        with self._transaction():
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                # 旧版本的结果没有命名空间与全局变量信息，全部丢弃
+                self._conn.execute('DROP TABLE IF EXISTS memo')
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS memo ('
+                'namespace TEXT NOT NULL, function TEXT NOT NULL, body TEXT NOT NULL, key TEXT NOT NULL, '
+                'value BLOB NOT NULL, used REAL NOT NULL, '
+                'PRIMARY KEY (namespace, function, body, key))'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS memo_used ON memo (namespace, function, body, used)')
+            # 函数体已经改变，同一命名空间中旧的结果全部失效
+            self._conn.execute('DELETE FROM memo WHERE namespace = ? AND function = ? AND body != ?', self._scope)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """当前进程的数据库连接，在fork出的子进程中第一次访问时重新打开"""
+        if self._pid != os.getpid():
+            if self._connection is not None:
+                _INHERITED_CONNECTIONS.append(self._connection)
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._pid = os.getpid()
+        return self._connection
+
+    def __reduce__(self):
+        # 数据库连接不能序列化，快照中只保存参数，读取时重新打开
+        return (MemoStore, (self.name, self.body_hash, self.maxsize, self.path, self.namespace))
+    
+    @contextmanager
+    def _transaction(self):
+        """写事务：立即获取写锁，其他进程写入时等待"""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+
+    def get(self, key: str) -> Any:
+        """读取结果，不存在时返回MISSING"""
+        row = self._conn.execute(
+            'SELECT value FROM memo WHERE namespace = ? AND function = ? AND body = ? AND key = ?',
+            (*self._scope, key),
+        ).fetchone()
+        if row is None:
+            return MISSING
+        if self.maxsize is not None:
+            with self._transaction():
+                self._conn.execute(
+                    'UPDATE memo SET used = ? WHERE namespace = ? AND function = ? AND body = ? AND key = ?',
+                    (time.time(), *self._scope, key),
+                )
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> bool:
+        """保存结果，结果无法序列化时不保存并返回False"""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        with self._transaction():
+            self._conn.execute(
+                'INSERT OR REPLACE INTO memo (namespace, function, body, key, value, used) VALUES (?, ?, ?, ?, ?, ?)',
+                (*self._scope, key, data, time.time()),
+            )
+            if self.maxsize is not None:
+                self._conn.execute(
+                    'DELETE FROM memo WHERE rowid IN ('
+                    'SELECT rowid FROM memo WHERE namespace = ? AND function = ? AND body = ? '
+                    'ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                    (*self._scope, self.maxsize),
+                )
+        return True
+
+    def clear(self) -> None:
+        """删除该命名空间中该函数的全部结果"""
+        with self._transaction():
+            self._conn.execute('DELETE FROM memo WHERE namespace = ? AND function = ?', (self.namespace, self.name))
+
+    def __len__(self):
+        row = self._conn.execute(
+            'SELECT COUNT(*) FROM memo WHERE namespace = ? AND function = ? AND body = ?', self._scope
+        ).fetchone()
+        return row[0]
+
+
+class PersistentMemoCache(MemoCache):
+    """内存缓存之后带有持久化存储的记忆化缓存
+
+    先在内存中查找，未命中时再读取MemoStore，新的结果同时写入两者。
+    缓存键除参数外还包括函数体读取的全局变量当前的值（见globals_key），
+    全局变量不同的脚本或同一脚本中全局变量改变后不会取到之前的结果。
+    """
+
+    def __init__(self, store: MemoStore, maxsize: int | None = None, func: EW_Function | EW_MFunction | None = None):
+        """初始化缓存
+
+        Args:
+            store: 持久化存储
+            maxsize: 内存中最多缓存的结果个数，None表示不限制
+            func: 被记忆化的函数，其读取的全局变量计入缓存键
+        """
+        super().__init__(maxsize)
+        self.store = store
+        self.disk_hits = 0  # 内存未命中、从持久化存储读到的结果数
+        self._body = func.body if func is not None else None
+        self._names = free_globals(func) if func is not None else ()
+        self._env = func.env if func is not None else None
+
+    def _full_key(self, key: tuple) -> tuple | None:
+        """参数的缓存键加上全局变量的值，全局变量无法表示时返回None"""
+        if not self._names:
+            return key
+        try:
+            return key, globals_key(self._names, self._env, frozenset((id(self._body),)))
+        except Unfingerprintable:
+            return None
+
+    @staticmethod
+    def _store_key(key: tuple) -> str | None:
+        """持久化存储中的键，缓存键无法转换为文本时返回None（只在内存中缓存）"""
+        try:
+            return hashlib.sha256(canonical(key).encode('utf-8')).hexdigest()
+        except Unfingerprintable:
+            return None
+
+    def get(self, key: tuple) -> Any:
+        full = self._full_key(key)
+        if full is None:
+            self.misses += 1
+            return MISSING
+        return super().get(full)
+
+    def _lookup(self, key: tuple) -> Any:
+        value = super()._lookup(key)
+        if value is MISSING:
+            store_key = self._store_key(key)
+            if store_key is None:
+                return MISSING
+            value = self.store.get(store_key)
+            if value is not MISSING:
+                self.disk_hits += 1
+                super().put(key, value)
+        return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        key = self._full_key(key)
+        if key is None:
+            return
+        super().put(key, value)
+        store_key = self._store_key(key)
+        if store_key is not None:
+            self.store.put(store_key, value)
+
+    def clear(self) -> None:
+        super().clear()
+        self.store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats['disk_hits'] = self.disk_hits
+        stats['disk_size'] = len(self.store)
+        return stats
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Dict
+from core.Cache import cache_path
+from core.Env import Env
+
+# Exwide源码模块（.ew文件）：在独立的全局环境中执行，模块中定义的变量与函数成为包的成员。
+# 解析后的AST缓存在缓存目录的AST_CACHE_DIR子目录中，以源码、数值模式与AST_CACHE_VERSION的哈希为文件名。
+# 数字字面量在解析时按当前的数值模式构造，不同模式下的AST不能共用。
+AST_CACHE_DIR = 'ast'
+AST_CACHE_VERSION = 1  # AST结构改变时递增，旧的缓存随之失效
+
+
+def _ast_cache_file(source: bytes) -> str:
+    from core.Type import get_numeric_context
+    numeric = get_numeric_context()
+    key = hashlib.sha256(f'{AST_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:'
+                         f'{numeric.mode}:{numeric.precision}:'.encode() + source)
+    directory = cache_path(AST_CACHE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{key.hexdigest()}.pickle')
+
+
+def parse_source(source: bytes) -> list:
+    """解析Exwide源码，返回AST
+    
+    同样的源码已经解析过时直接读取缓存的AST，否则解析源码并写入缓存。
+    缓存损坏或无法写入时不影响结果，只是需要重新解析。
+    """
+    cache_file = _ast_cache_file(source)
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # 没有缓存，或缓存文件无法读取，重新解析
+        pass
+    
+    from core.Lexer import Lexer
+    from core.Parser import parse
+    code = source.decode('utf-8') + '\n'
+    ast = parse(Lexer().tokenize(code), code)
+    
+    # 先写入临时文件再替换，其他进程不会读到写了一半的缓存
+    try:
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, cache_file)
+    except OSError:
+        pass
+    return ast
+
+
+def load_module_ast(file_path: str) -> list:
+    """读取Exwide源码模块的AST，源码未改变时使用缓存"""
+    with open(file_path, 'rb') as f:
+        return parse_source(f.read())
+
+
+def exec_ew_module(file_path: str, package_name: str) -> Dict[str, Any]:
+    """在独立的全局环境中执行Exwide源码模块，返回模块中定义的变量与函数
+    
+    模块的全局环境只包含内置函数与已注册的包，与新运行的脚本相同，看不到导入它的脚本中的变量。
+    """
+    from core.Package import packages
+    from core.Parser import Interpreter
+    from core.ew_builtins import ew_builtins
+    ast = load_module_ast(file_path)
+    base = {**ew_builtins, **packages}
+    env = Env(**base)
+    Interpreter(env).run(ast)
+    # 新定义的名称，以及重新定义的内置函数或包名
+    return {name: value for name, value in env.vals.items() if name not in base or base[name] is not value}
@@ -1,15 +1,58 @@
 from typing import Dict, Any, List
+import importlib.util
+import json
 import os
 import sys
+from core.Cache import cache_path
 from core.Error import raise_err, EW_RUNTIME_ERROR
+from core.Signature import annotate
 from core.Type import EW_Type
 
 class EW_Package(EW_Type):
-    """Exwide包类型"""
+    """Exwide包类型
     
-    def __init__(self, name: str, functions: Dict[str, Any]):
+    从文件创建的包是惰性的：创建时只记录文件路径，第一次访问包中的函数时才执行包文件。
+    包文件可以是Python文件（packall字典）或Exwide源码模块（.ew文件中定义的全部变量与函数）。
+    """
+    
+    def __init__(self, name: str, functions: Dict[str, Any] | None = None, path: str | None = None):
         self.name = name
-        self.functions = functions
+        self.path = path
+        self._functions = functions
+        self._loading = False
+    
+    @property
+    def functions(self) -> Dict[str, Any]:
+        """包中的函数，包文件尚未执行时先执行"""
+        if self._functions is None:
+            if self._loading:
+                raise_err(EW_RUNTIME_ERROR, f'Circular import of package {self.name}')
+                return None
+            self._loading = True
+            try:
+                self._functions = exec_package(self.path, self.name)
+            finally:
+                self._loading = False
+        return self._functions
+    
+    @property
+    def loaded(self) -> bool:
+        """包文件是否已经执行"""
+        return self._functions is not None
+    
+    def __reduce__(self):
+        # 从文件创建的包在快照中只保存包名与路径，读取时重新注册，仍然在第一次使用时才执行
+        if self.path is None:
+            return super().__reduce__()
+        return (restore_package, (self.name, self.path))
+    
+    def member(self, name: str) -> Any:
+        """按名称取得包中的函数
+        
+        Raises:
+            KeyError: 包中没有该函数
+        """
+        return self.functions[name]
     
     def __getitem__(self, key: Any) -> Any:
         """访问包中的函数"""
@@ -36,72 +79,258 @@ package_paths = [
     os.path.join(os.path.dirname(os.path.dirname(__file__)), 'includes')
 ]
 
-def load_package_from_file(file_path: str) -> EW_Package:
-    """从文件加载包"""
-    # 读取文件内容，解析包名
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# 额外的包搜索路径，多个目录用os.pathsep分隔，排在package_paths之后
+PATH_ENV = 'EXWIDE_PATH'
+
+# 包索引的缓存文件
+INDEX_FILE = 'packages.json'
+INDEX_VERSION = 2
+
+# 包文件的扩展名与其中注释的开头
+PACKAGE_SUFFIXES = {'.py': '#', '.ew': '//'}
+
+def search_paths() -> List[str]:
+    """返回全部包搜索路径：package_paths与环境变量EXWIDE_PATH中的目录"""
+    extra = [path for path in os.environ.get(PATH_ENV, '').split(os.pathsep) if path]
+    return package_paths + extra
+
+def package_name_of(file_path: str) -> str:
+    """解析包名：文件开头的第一行注释，没有注释时使用文件名
     
-    # 解析包名（第一行注释）
-    lines = content.split('\n')
+    只读取文件开头的空行与注释，遇到代码即停止。Python文件的注释以#开头，Exwide源码模块以//开头。
+    """
+    filename, suffix = os.path.splitext(os.path.basename(file_path))
+    comment = PACKAGE_SUFFIXES.get(suffix, '#')
     package_name = None
-    for line in lines:
-        line = line.strip()
-        if line.startswith('#'):
-            # 提取包名（去掉#和空格）
-            package_name = line[1:].strip()
-            break
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(comment):
+                # 提取包名（去掉注释符号和空格）
+                package_name = line[len(comment):].strip()
+                break
+            if line:
+                break
     
     if not package_name:
-        # 如果没有找到包名，使用文件名（去掉.py后缀，去掉EW_前缀）
-        filename = os.path.basename(file_path).replace('.py', '')
+        # 如果没有找到包名，使用文件名（去掉扩展名，去掉EW_前缀）
         if filename.startswith('EW_'):
             package_name = filename[3:]
         else:
             package_name = filename
+    return package_name
+
+def exec_package(file_path: str, package_name: str) -> Dict[str, Any]:
+    """执行包文件，返回包中的函数"""
+    if file_path.endswith('.ew'):
+        from core.Module import exec_ew_module
+        return exec_ew_module(file_path, package_name)
+    return exec_python_package(file_path, package_name)
+
+def exec_python_package(file_path: str, package_name: str) -> Dict[str, Any]:
+    """以Python模块的形式导入包文件，返回其中的packall字典
     
-    # 执行模块，获取packall字典
-    module_globals = {
-        '__file__': file_path,
-        '__name__': f'package.{package_name}'
-    }
+    通过importlib导入，包文件编译后的字节码缓存在__pycache__中，源文件未修改时不再重新编译。
+    """
+    module_name = f'package.{package_name}'
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            exec(f.read(), module_globals)
+        spec.loader.exec_module(module)
     except Exception as e:
+        del sys.modules[module_name]
         raise_err(EW_RUNTIME_ERROR, f'Error loading package {package_name}: {e}')
         return None
     
-    # 获取packall字典
-    packall = module_globals.get('packall', {})
+    # 获取packall字典，并预先计算各函数的参数个数范围
+    functions = getattr(module, 'packall', {})
+    annotate(functions)
+    return functions
+
+def load_package_from_file(file_path: str, package_name: str | None = None) -> EW_Package:
+    """从文件创建并注册包，包文件在第一次访问包中的函数时才执行
     
-    # 创建并注册包
-    package = EW_Package(package_name, packall)
+    Args:
+        file_path: 包文件路径
+        package_name: 包名，省略时从文件开头的注释中解析
+    """
+    package_name = package_name or package_name_of(file_path)
+    package = EW_Package(package_name, path=file_path)
     packages[package_name] = package
-    
     return package
 
-def auto_load_all_packages() -> None:
-    """自动加载所有包搜索路径下的所有包，根据文件第一行注释提取包名"""
-    for path in [os.path.join(os.path.dirname(os.path.dirname(__file__)), 'pack')]:
-        if os.path.exists(path):
-            for file in os.listdir(path):
-                if file.endswith('.py'):
-                    file_path = os.path.join(path, file)
-                    load_package_from_file(file_path)
+class PackageIndex:
+    """包名到包文件路径的索引
+    
+    每个目录只扫描一次，记录目录中各文件的包名与目录的修改时间，并保存到缓存目录。
+    之后每个目录只需一次stat：修改时间未变时直接使用保存的结果，改变时（增删或重命名文件）重新扫描该目录。
+    只修改文件开头的包名注释不会改变目录的修改时间，因此查找不到包时会重新扫描各个目录一次再下结论。
+    """
+    
+    def __init__(self, path: str | None = None):
+        """初始化索引，读取保存的结果
+        
+        Args:
+            path: 索引文件路径，默认为缓存目录下的INDEX_FILE
+        """
+        self.path = path or cache_path(INDEX_FILE)
+        self._dirs: Dict[str, dict] = self._read()
+        self._checked: set[str] = set()  # 本次运行中已经核对过修改时间的目录
+        self._rescanned: set[str] = set()  # 本次运行中因查找不到包而重新扫描过的目录
+        self._names: Dict[str, Dict[str, tuple[str, str]]] = {}  # 目录 -> 包名与文件名 -> (包名, 文件路径)
+        self._dirty = False
+    
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return {}
+        return data.get('dirs', {})
+    
+    def save(self) -> None:
+        """保存重新扫描后的索引，先写入临时文件再替换，多个进程同时写入时不会得到损坏的文件"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        # 只有索引改变时才需要，不在启动时导入
+        import tempfile
+        directory = os.path.dirname(self.path)
+        try:
+            fd, temp = tempfile.mkstemp(dir=directory, prefix='.packages-', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'dirs': self._dirs}, f)
+            os.replace(temp, self.path)
+        except OSError:
+            pass
+    
+    def _scan(self, directory: str, mtime: int) -> dict:
+        entries = []
+        for file in sorted(os.listdir(directory)):
+            if os.path.splitext(file)[1] in PACKAGE_SUFFIXES:
+                file_path = os.path.join(directory, file)
+                entries.append([package_name_of(file_path), file_path])
+        return {'mtime': mtime, 'packages': entries}
+    
+    def packages_in(self, directory: str) -> List[List[str]]:
+        """返回目录中的全部包，每项为[包名, 文件路径]，目录不存在时返回空列表"""
+        entry = self._dirs.get(directory)
+        if directory not in self._checked:
+            self._checked.add(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is None:
+                entry = None
+                self._dirty |= self._dirs.pop(directory, None) is not None
+            elif entry is None or entry['mtime'] != mtime:
+                entry = self._dirs[directory] = self._scan(directory, mtime)
+                self._dirty = True
+        return entry['packages'] if entry else []
+    
+    def _rescan(self, directory: str) -> bool:
+        """不论修改时间是否改变都重新扫描目录，返回目录中的包是否有变化；每次运行每个目录最多一次"""
+        if directory in self._rescanned:
+            return False
+        self._rescanned.add(directory)
+        self._checked.add(directory)
+        try:
+            entry = self._scan(directory, os.stat(directory).st_mtime_ns)
+        except OSError:
+            return False
+        if entry == self._dirs.get(directory):
+            return False
+        self._dirs[directory] = entry
+        self._names.pop(directory, None)
+        self._dirty = True
+        return True
+    
+    def _names_in(self, directory: str) -> Dict[str, tuple[str, str]]:
+        names = self._names.get(directory)
+        if names is None:
+            entries = self.packages_in(directory)
+            # 包名优先于文件名
+            names = {os.path.splitext(os.path.basename(path))[0]: (name, path) for name, path in entries}
+            names.update((name, (name, path)) for name, path in reversed(entries))
+            self._names[directory] = names
+        return names
+    
+    def find(self, package_name: str, paths: List[str] | None = None) -> tuple[str, str] | None:
+        """按搜索路径的顺序查找包，返回(包名, 文件路径)
+        
+        优先匹配文件开头注释中的包名，其次匹配文件名。
+        找不到时重新扫描各个目录（可能只修改了文件开头的包名注释）后再查找一次。
+        """
+        dirs = search_paths() if paths is None else paths
+        try:
+            found = self._lookup(package_name, dirs)
+            if found is None and any([self._rescan(directory) for directory in dirs]):
+                found = self._lookup(package_name, dirs)
+            return found
+        finally:
+            self.save()
+    
+    def _lookup(self, package_name: str, dirs: List[str]) -> tuple[str, str] | None:
+        for directory in dirs:
+            found = self._names_in(directory).get(package_name)
+            if found is not None:
+                return found
+        return None
+    
+    def refresh(self) -> None:
+        """丢弃全部结果，下次查找时重新扫描"""
+        self._dirs.clear()
+        self._checked.clear()
+        self._rescanned.clear()
+        self._names.clear()
+        self._dirty = True
+
+_index: PackageIndex | None = None
+
+def package_index() -> PackageIndex:
+    """返回全局的包索引"""
+    global _index
+    if _index is None:
+        _index = PackageIndex()
+    return _index
+
+def auto_load_all_packages(paths: List[str] | None = None) -> None:
+    """注册包目录（默认为pack）下的所有包，根据文件第一行注释提取包名
+    
+    只解析包名，不执行包文件，启动时间不随包的数量与大小增长。
+    """
+    index = package_index()
+    for path in package_paths[:1] if paths is None else paths:
+        for name, file_path in index.packages_in(path):
+            load_package_from_file(file_path, name)
+    index.save()
+
+def restore_package(package_name: str, file_path: str) -> EW_Package:
+    """从快照中恢复包：已经注册了同一个文件时直接使用，否则重新注册"""
+    package = packages.get(package_name)
+    if package is not None and package.path == file_path:
+        return package
+    return load_package_from_file(file_path, package_name)
 
 def load_package(package_name: str) -> EW_Package:
-    """加载指定名称的包"""
+    """加载指定名称的包，按包索引查找包文件"""
     # 检查包是否已加载
     if package_name in packages:
         return packages[package_name]
     
-    # 搜索包文件
-    for path in package_paths:
-        file_path = os.path.join(path, f'{package_name}.py')
-        if os.path.exists(file_path):
-            return load_package_from_file(file_path)
+    found = package_index().find(package_name)
+    if found is not None:
+        name, file_path = found
+        # 按文件名导入时，同一个文件可能已经以注释中的包名注册
+        package = packages.get(name)
+        if package is not None and package.path == file_path:
+            return package
+        return load_package_from_file(file_path, name)
     
     raise_err(EW_RUNTIME_ERROR, f'Package {package_name} not found')
     return None
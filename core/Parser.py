@@ -3,9 +3,12 @@ from core.Token import *
 from core.Env import *
 from core.Type import *
 from core.Package import import_package, EW_Package, auto_load_all_packages, packages
-from core.Error import raise_err, push_stack, pop_stack
+from core.Error import raise_err, push_stack, pop_stack, ld_show
+from core.Log import Lazy, get_logger
 from typing import Any, TypeAlias
-from core.ew_builtins import ew_builtins
+from core.ew_builtins import EW_builtins, ew_builtins
+from core.Memo import MISSING, detach, memo_key
+from core.Signature import arity_message, function_arity
 import sys
 sys.setrecursionlimit(1000000)
 
@@ -13,6 +16,30 @@ ASTNode: TypeAlias = dict[str, Any]
 MayASTNode: TypeAlias = ASTNode | None
 ASTNodelist: TypeAlias = list[ASTNode]
 
+_parse_log = get_logger('parser')
+_run_log = get_logger('interp')
+
+
+class MemberSite:
+    """点号成员访问（如 math.add）处的缓存：上次访问的包与取得的成员
+    
+    再次执行时，只要点号左侧求值得到的仍是同一个包，就直接返回缓存的成员；
+    包变量被重新绑定为其他对象时自动失效。
+    """
+    
+    __slots__ = ('package', 'value')
+    
+    def __init__(self):
+        self.package = None
+        self.value = None
+    
+    def __reduce__(self):
+        # 复制与序列化AST时不保留缓存
+        return (MemberSite, ())
+    
+    def __deepcopy__(self, memo):
+        return MemberSite()
+
 class Parser:
     """语法解析器"""
     
@@ -26,15 +53,15 @@ class Parser:
     
     def parse(self) -> ASTNodelist:
         """解析token序列为AST"""
-        clog(f'函数 parse({ld_show(self.tokens)}) 开始')
+        _parse_log.debug('函数 parse(%s) 开始', Lazy(ld_show, self.tokens))
         
         while self._is_valid():
-            clog(f'当前位于 token #{self.current}: {self._current_token()}')
+            _parse_log.debug('当前位于 token #%s: %s', self.current, self._current_token())
             node = self._parse_statement()
             if node:
                 self.ast.append(node)
         
-        clog('函数 parse 结束')
+        _parse_log.debug('函数 parse 结束')
         return self.ast
     
     def _parse_statement(self) -> MayASTNode:
@@ -97,7 +124,7 @@ class Parser:
                         'name': left_expr['name'],
                         'value': value
                     }
-                elif left_expr['kind'] == 'TableAccess':
+                elif left_expr['kind'] in ('TableAccess', 'MemberAccess'):
                     # Table访问赋值
                     return {
                         'kind': 'TableAssign',
@@ -117,9 +144,9 @@ class Parser:
     
     def _parse_expression_statement(self) -> MayASTNode:
         """解析表达式语句（只处理ENDL作为语句结束符）"""
-        clog('95 发现表达式语句')
+        _parse_log.debug('95 发现表达式语句')
         expr = self._parse_expression()
-        clog(f'表达式语句解析完成: 表达式={expr}')
+        _parse_log.debug('表达式语句解析完成: 表达式=%s', expr)
         if expr:
             # 检查是否有后续表达式
             if self._is_valid() and self._current_token().typ != 'ENDL':
@@ -135,20 +162,20 @@ class Parser:
     
     def _parse_return_statement(self) -> ASTNode:
         """解析return语句"""
-        clog('发现return语句')
+        _parse_log.debug('发现return语句')
         self._advance()  # 跳过 'return'
         
         # 解析返回值表达式
         value = None
-        clog(f'当前Token: {self._current_token()}')
+        _parse_log.debug('当前Token: %s', self._current_token())
         if self._is_valid() and self._current_token().typ not in ['ENDL', 'RBRACE']:
             value = self._parse_expression()
-            clog(f'value: {value}')
+            _parse_log.debug('value: %s', value)
         
         # 消费语句结束符
         self._consume_endls()
         
-        clog(f'return语句解析完成: 返回值={value}')
+        _parse_log.debug('return语句解析完成: 返回值=%s', value)
         return {
             'kind': 'Return',
             'value': value
@@ -156,7 +183,7 @@ class Parser:
     
     def _parse_if_statement(self) -> ASTNode:
         """解析if语句"""
-        clog('发现if语句')
+        _parse_log.debug('发现if语句')
         self._advance()  # 跳过 'if'
         
         # 解析条件表达式
@@ -215,7 +242,7 @@ class Parser:
             self._advance()  # 跳过 '}'
             self._consume_endls()
         
-        clog(f'if语句解析完成: 条件={condition}, if分支长度={len(if_body)}, else分支长度={0 if else_body is None else len(else_body)}')
+        _parse_log.debug('if语句解析完成: 条件=%s, if分支长度=%s, else分支长度=%s', condition, len(if_body), 0 if else_body is None else len(else_body))
         return {
             'kind': 'If',
             'condition': condition,
@@ -243,7 +270,7 @@ class Parser:
     
     def _parse_while_statement(self) -> ASTNode:
         """解析while语句"""
-        clog('发现while语句')
+        _parse_log.debug('发现while语句')
         self._advance()  # 跳过 'while'
         
         # 解析条件表达式
@@ -288,7 +315,7 @@ class Parser:
         Returns:
             包含装饰器信息的函数声明AST节点
         """
-        clog('发现函数声明')
+        _parse_log.debug('发现函数声明')
         self._advance()  # 跳过 'func'
         
         # 检查标识符是否合法
@@ -370,7 +397,7 @@ class Parser:
         if decorators:
             func_node['decorators'] = decorators
         
-        clog(f'函数声明解析完成: 名称={name}, 参数={params}, 装饰器={decorators}, 函数体长度={len(body)}')
+        _parse_log.debug('函数声明解析完成: 名称=%s, 参数=%s, 装饰器=%s, 函数体长度=%s', name, params, decorators, len(body))
         return func_node
 
     def _parse_mfunc_statement(self, decorators=None) -> ASTNode:
@@ -382,7 +409,7 @@ class Parser:
         Returns:
             包含装饰器信息的mfunc声明AST节点
         """
-        clog('发现mfunc语句')
+        _parse_log.debug('发现mfunc语句')
         self._advance()  # 跳过 'mfunc'
         
         # 检查标识符是否合法
@@ -464,12 +491,12 @@ class Parser:
         if decorators:
             mfunc_node['decorators'] = decorators
         
-        clog(f'mfunc声明解析完成: 名称={name}, 参数={params}, 装饰器={decorators}, 函数体长度={len(body)}')
+        _parse_log.debug('mfunc声明解析完成: 名称=%s, 参数=%s, 装饰器=%s, 函数体长度=%s', name, params, decorators, len(body))
         return mfunc_node
     
     def _parse_import_statement(self) -> ASTNode:
         """解析import语句"""
-        clog('发现import语句')
+        _parse_log.debug('发现import语句')
         self._advance()  # 跳过 'import'
         
         # 检查包名是否合法
@@ -483,7 +510,7 @@ class Parser:
         # 消费语句结束符
         self._consume_endls()
         
-        clog(f'import声明解析完成: 包名={package_name}')
+        _parse_log.debug('import声明解析完成: 包名=%s', package_name)
         return {
             'kind': 'Import',
             'name': package_name
@@ -492,7 +519,7 @@ class Parser:
     def _parse_expression(self) -> MayASTNode:
         """解析表达式"""
         # 根据当前括号类型决定是否跳过换行符
-        clog(f'解析表达式：{self._is_valid()=}, {self._current_token()=}')
+        _parse_log.debug('解析表达式：self._is_valid()=%r, self._current_token()=%r', self._is_valid(), self._current_token())
         while self._is_valid() and self._current_token().typ == 'ENDL' and self._should_ignore_endl():
             self._advance()
         
@@ -585,10 +612,10 @@ class Parser:
     
     def _parse_function_call(self, func_expr: ASTNode) -> ASTNode:
         """解析函数调用（作为运算符处理）"""
-        clog(f'351 发现函数调用{func_expr}, 当前Token #{self.current}: {self._current_token()}')
+        _parse_log.debug('351 发现函数调用%s, 当前Token #%s: %s', func_expr, self.current, self._current_token())
         self._advance()  # 跳过左括号
         self.paren_stack.append('paren')  # 进入圆括号
-        clog(f'353 跳过括号, 当前Token #{self.current}: {self._current_token()}')
+        _parse_log.debug('353 跳过括号, 当前Token #%s: %s', self.current, self._current_token())
         
         args = []
         
@@ -597,20 +624,20 @@ class Parser:
         # 如果右括号紧跟着，说明没有参数
         if self._is_valid() and self._current_token().typ == 'RPAREN':
             no_args = True
-            clog('[')
-            clog(f'令no_args为True')
-            clog(f'对于对函数{func_expr}的parse, 当前Token #{self.current}: {self._current_token()}')
+            _parse_log.debug('[')
+            _parse_log.debug('令no_args为True')
+            _parse_log.debug('对于对函数%s的parse, 当前Token #%s: %s', func_expr, self.current, self._current_token())
             self._advance()  # 跳过右括号
             self.paren_stack.pop()  # 退出圆括号
-            clog(f'函数{func_expr}调用: 无参数')
-            clog(f'366 跳过括号，当前Token #{self.current}: {self._current_token()}')
-            clog(']')
+            _parse_log.debug('函数%s调用: 无参数', func_expr)
+            _parse_log.debug('366 跳过括号，当前Token #%s: %s', self.current, self._current_token())
+            _parse_log.debug(']')
         else:
             # 解析参数列表
             while self._is_valid():
                 # 检查是否遇到右括号（参数列表结束）
                 if self._current_token().typ == 'RPAREN':
-                    clog(f'374 当前的Token #{self.current}为: {self._current_token()}, 跳过右括号')
+                    _parse_log.debug('374 当前的Token #%s为: %s, 跳过右括号', self.current, self._current_token())
                     break
                     
                 # 跳过换行符
@@ -634,29 +661,29 @@ class Parser:
                     self._advance()
                 else:
                     # 不是逗号也不是右括号，报错
-                    clog(f'398 当前的Token #{self.current}为: {self._current_token()}')
+                    _parse_log.debug('398 当前的Token #%s为: %s', self.current, self._current_token())
                     raise_err(EW_SYNTAX_ERROR, f'Expected comma or closing parenthesis, got {self._current_token().val if self._current_token().val != "\n" else "a newline"}')
                     return None
     
-        clog(f'402 当前对于对{func_expr}的parse的Token #{self.current}为: {self._current_token()}')
+        _parse_log.debug('402 当前对于对%s的parse的Token #%s为: %s', func_expr, self.current, self._current_token())
         # 检查右括号
         if not self._is_valid() or self._current_token().typ != 'RPAREN' and not no_args:
             raise_err(EW_SYNTAX_ERROR, f'Expected closing parenthesis, got {self._current_token().val if self._current_token().val != "\n" else "a newline"}')
             return None
-        clog(f'{no_args}')
+        _parse_log.debug('%s', no_args)
         if not no_args:
             self._advance()
             self.paren_stack.pop()  # 退出圆括号
-            clog(f'跳过括号后, 当前对于对{func_expr}的parse的Token #{self.current}: {self._current_token()}')
+            _parse_log.debug('跳过括号后, 当前对于对%s的parse的Token #%s: %s', func_expr, self.current, self._current_token())
         else:
-            clog('不跳过括号')
-        clog(f'函数{func_expr}调用: 参数数量: {len(args)}')
+            _parse_log.debug('不跳过括号')
+        _parse_log.debug('函数%s调用: 参数数量: %s', func_expr, len(args))
         result = {
             'kind': 'FuncCall',
             'func': func_expr,
             'args': args
         }
-        clog(f'函数{func_expr}调用结束, 将会返回 {ld_show(result)}')
+        _parse_log.debug('函数%s调用结束, 将会返回 %s', func_expr, Lazy(ld_show, result))
         
         # 检查并处理可能的后续表达式操作，如列表访问或属性访问
         # 检查是否是包访问表达式，如package.func
@@ -696,10 +723,10 @@ class Parser:
         elif token.typ == 'LBRACK':
             expr = self._parse_list_literal()
         elif token.typ == 'DO':
-            clog(f'token #{ self.current } {token}: do')
+            _parse_log.debug('token #%s %s: do', self.current, token)
             expr = self._parse_do_expression()
         else:
-            clog(f'当前的Token类型为: {token.typ}, 未知')
+            _parse_log.debug('当前的Token类型为: %s, 未知', token.typ)
             # 使用token中记录的行列位置
             line = token.line
             
@@ -734,7 +761,7 @@ class Parser:
     
     def _parse_do_expression(self) -> ASTNode:
         """解析do表达式"""
-        clog('发现do表达式')
+        _parse_log.debug('发现do表达式')
         self._advance()  # 跳过 'do'
         
         # 解析参数列表
@@ -794,7 +821,7 @@ class Parser:
         
         self._advance()  # 跳过 '}'
         
-        clog(f'do表达式解析完成: 参数={params}, 函数体长度={len(body)}')
+        _parse_log.debug('do表达式解析完成: 参数=%s, 函数体长度=%s', params, len(body))
         return {
             'kind': 'DoExpr',
             'params': params,
@@ -809,7 +836,7 @@ class Parser:
     
     def _parse_assignment(self) -> ASTNode:
         """解析变量赋值"""
-        clog('发现赋值操作')
+        _parse_log.debug('发现赋值操作')
         identifier = self._current_token()
         self._advance()  # 跳过标识符
         
@@ -825,7 +852,7 @@ class Parser:
         # 消费语句结束符
         self._consume_endls()
         
-        clog(f'赋值: {identifier.val} = {value}')
+        _parse_log.debug('赋值: %s = %s', identifier.val, value)
         return {
             'kind': 'VarAssign',
             'name': identifier.val,
@@ -834,13 +861,13 @@ class Parser:
     
     def _parse_literal(self) -> ASTNode:
         """解析字面量"""
-        clog('发现字面量')
+        _parse_log.debug('发现字面量')
         token = self._current_token()
         self._advance()
         
         if token.typ == 'NUMBER':
             value_type = EW_Number
-            value = EW_Number(token.val)
+            value = EW_Number.from_literal(token.val)
         else:  # STRING
             value_type = EW_String
             value = EW_String(token.val)
@@ -853,12 +880,12 @@ class Parser:
     
     def _parse_boolean_literal(self) -> ASTNode:
         """解析布尔字面量 true 和 false"""
-        clog('发现布尔字面量')
+        _parse_log.debug('发现布尔字面量')
         token = self._current_token()
         self._advance()
         
         # 创建布尔值
-        value = EW_Boolean(True if token.val == 'true' else False)
+        value = TRUE if token.val == 'true' else FALSE
         
         return {
             'kind': 'Lit',
@@ -868,7 +895,7 @@ class Parser:
     
     def _parse_table_literal(self) -> ASTNode:
         """解析Table字面量，如 {"foobar": 42, 24: "Hi!"}"""
-        clog('发现Table字面量')
+        _parse_log.debug('发现Table字面量')
         self._advance()  # 跳过左花括号
         self.paren_stack.append('table')  # 进入Table花括号
         
@@ -929,7 +956,7 @@ class Parser:
     
     def _parse_list_literal(self) -> ASTNode:
         """解析列表字面量，如 [1, true, 'Hi!', do (x) {return x + 1}]"""
-        clog('发现List字面量')
+        _parse_log.debug('发现List字面量')
         self._advance()  # 跳过左方括号
         self.paren_stack.append('bracket')  # 进入方括号
         
@@ -970,12 +997,34 @@ class Parser:
         }
     
     def _parse_table_access(self, table_expr: ASTNode) -> ASTNode:
-        """解析Table访问表达式，如 table[key]"""
-        clog('发现Table访问表达式')
+        """解析Table访问表达式，如 table[key]，以及列表切片，如 list[a:b]、list[a:]、list[:b]"""
+        _parse_log.debug('发现Table访问表达式')
         self._advance()  # 跳过左方括号
         
-        # 解析键表达式
-        key_expr = self._parse_expression()
+        # 解析键表达式，切片可以省略起始下标
+        key_expr = None
+        if not self._is_valid() or self._current_token().typ != 'COLON':
+            key_expr = self._parse_expression()
+        
+        # 切片
+        if self._is_valid() and self._current_token().typ == 'COLON':
+            self._advance()  # 跳过冒号
+            stop_expr = None
+            if self._is_valid() and self._current_token().typ != 'RBRACK':
+                stop_expr = self._parse_expression()
+            
+            if not self._is_valid() or self._current_token().typ != 'RBRACK':
+                raise_err(EW_SYNTAX_ERROR, f'Expected closing bracket, got {self._current_token().val}')
+                return None
+            
+            self._advance()  # 跳过右方括号
+            
+            return {
+                'kind': 'ListSlice',
+                'list': table_expr,
+                'start': key_expr,
+                'stop': stop_expr
+            }
         
         # 检查右方括号
         if not self._is_valid() or self._current_token().typ != 'RBRACK':
@@ -992,7 +1041,7 @@ class Parser:
     
     def _parse_package_access(self, obj_expr: ASTNode) -> ASTNode:
         """解析包访问表达式，如 package.func"""
-        clog('发现包访问表达式')
+        _parse_log.debug('发现包访问表达式')
         self._advance()  # 跳过点操作符
         
         # 检查方法名是否合法
@@ -1004,15 +1053,17 @@ class Parser:
         method_name = self._current_token().val
         self._advance()  # 跳过方法名
         
-        # 包访问表达式可以转换为TableAccess表达式，使用字符串作为键
+        # 点号左侧是包时按成员名直接取得并缓存在访问处，否则与以字符串为键的Table访问相同
         return {
-            'kind': 'TableAccess',
+            'kind': 'MemberAccess',
             'table': obj_expr,
             'key': {
                 'kind': 'Lit',
                 'type': EW_String,
                 'val': EW_String(f'"{method_name}"')
-            }
+            },
+            'member': method_name,
+            'site': MemberSite()
         }
     
     def _parse_parenthesized(self) -> MayASTNode:
@@ -1125,19 +1176,22 @@ class Parser:
 class Interpreter:
     """解释执行器"""
     
-    def __init__(self, env: Env | None = None):
+    def __init__(self, env: Env | None = None, numeric: NumericContext | None = None):
         self.env = env or GENV
+        # 数值运算环境（数值模式与精度），默认使用当前生效的环境
+        self.numeric = numeric or get_numeric_context()
     
     def run(self, ast: ASTNodelist) -> Any:
         """执行AST"""
-        clog(f'函数 run({ld_show(ast)}) 开始')
+        _run_log.debug('函数 run(%s) 开始', Lazy(ld_show, ast))
         
         result = None
-        for node in ast:
-            clog(f'当前执行节点: {ld_show(node)}')
-            result = self._execute_node(node)
+        with self.numeric:
+            for node in ast:
+                _run_log.debug('当前执行节点: %s', Lazy(ld_show, node))
+                result = self._execute_node(node)
         
-        clog(f'函数 run({ld_show(ast)}) 结束')
+        _run_log.debug('函数 run(%s) 结束', Lazy(ld_show, ast))
         return result
     
     def _execute_node(self, node: ASTNode) -> Any:
@@ -1154,14 +1208,14 @@ class Interpreter:
     
     def _execute_funcdecl(self, node: ASTNode) -> None:
         """执行函数声明，将函数绑定到当前环境"""
-        clog('执行函数声明')
+        _run_log.debug('执行函数声明')
         
         # 获取函数名
         function_name = node['name']
         
         # 创建函数对象，传递正确的函数名
         func = EW_Function(node['params'], node['body'], self.env, function_name)
-        clog(f'创建函数对象: {func}')
+        _run_log.debug('创建函数对象: %s', func)
         
         # 应用装饰器
         if 'decorators' in node:
@@ -1170,24 +1224,24 @@ class Interpreter:
                 decorator_func = self._execute_node(decorator)
                 # 应用装饰器，将函数作为参数传递给装饰器
                 func = decorator_func(func)
-                clog(f'应用装饰器: {decorator}, 装饰后的函数: {func}')
+                _run_log.debug('应用装饰器: %s, 装饰后的函数: %s', decorator, func)
         
         # 将函数绑定到当前环境
         self.env[function_name] = func
-        clog(f'将函数 {function_name} 绑定到环境')
+        _run_log.debug('将函数 %s 绑定到环境', function_name)
         
         return None
     
     def _execute_mfuncdecl(self, node: ASTNode) -> None:
         """执行mfunc声明，将记忆化函数绑定到当前环境"""
-        clog('执行mfunc声明')
+        _run_log.debug('执行mfunc声明')
         
         # 获取函数名
         function_name = node['name']
         
         # 创建记忆化函数对象，传递正确的函数名
         func = EW_MFunction(node['params'], node['body'], self.env, function_name)
-        clog(f'创建记忆化函数对象: {func}')
+        _run_log.debug('创建记忆化函数对象: %s', func)
         
         # 应用装饰器
         if 'decorators' in node:
@@ -1196,45 +1250,45 @@ class Interpreter:
                 decorator_func = self._execute_node(decorator)
                 # 应用装饰器，将函数作为参数传递给装饰器
                 func = decorator_func(func)
-                clog(f'应用装饰器: {decorator}, 装饰后的函数: {func}')
+                _run_log.debug('应用装饰器: %s, 装饰后的函数: %s', decorator, func)
         
         # 将函数绑定到当前环境
         self.env[function_name] = func
-        clog(f'将记忆化函数 {function_name} 绑定到环境')
+        _run_log.debug('将记忆化函数 %s 绑定到环境', function_name)
         
         return None
     
     def _execute_import(self, node: ASTNode) -> None:
         """执行import语句，导入包"""
-        clog('执行import语句')
+        _run_log.debug('执行import语句')
         
         package_name = node['name']
         
         # 导入包
         import_package(package_name, self.env)
         
-        clog(f'导入包: {package_name}')
+        _run_log.debug('导入包: %s', package_name)
         return None
     
     def _execute_doexpr(self, node: ASTNode) -> 'EW_Function':
         """执行do表达式，返回函数对象"""
-        clog('执行do表达式')
+        _run_log.debug('执行do表达式')
         
         # 创建函数对象，使用默认名称
         func = EW_Function(node['params'], node['body'], self.env)
-        clog(f'创建函数对象: {func}')
+        _run_log.debug('创建函数对象: %s', func)
         
         return func
     
     def _execute_return(self, node: ASTNode) -> ASTNode:
         """执行return语句"""
-        clog('执行return语句')
+        _run_log.debug('执行return语句')
         
         value = None
         if node['value']:
             value = self._execute_node(node['value'])
         
-        clog(f'return值: {value}')
+        _run_log.debug('return值: %s', value)
         return {
             'kind': 'ReturnValue',
             'value': value
@@ -1242,15 +1296,15 @@ class Interpreter:
     
     def _execute_if(self, node: ASTNode) -> Any:
         """执行if语句"""
-        clog('执行if语句')
+        _run_log.debug('执行if语句')
         
         # 计算条件
         condition = self._execute_node(node['condition'])
-        clog(f'if条件结果: {condition}')
+        _run_log.debug('if条件结果: %s', condition)
         
         # 判断条件是否为真
         if condition:
-            clog('执行if分支')
+            _run_log.debug('执行if分支')
             result = None
             for stmt in node['if_body']:
                 result = self._execute_node(stmt)
@@ -1259,7 +1313,7 @@ class Interpreter:
                     return result
             return result
         elif node['else_body']:
-            clog('执行else分支')
+            _run_log.debug('执行else分支')
             result = None
             for stmt in node['else_body']:
                 result = self._execute_node(stmt)
@@ -1268,7 +1322,7 @@ class Interpreter:
                     return result
             return result
         else:
-            clog('条件为假且无else分支，返回None')
+            _run_log.debug('条件为假且无else分支，返回None')
             return None
     
     def _execute_varassign(self, node: ASTNode) -> None:
@@ -1276,13 +1330,13 @@ class Interpreter:
         variable_name = node['name']
         value = self._execute_node(node['value'])
         
-        clog(f'将变量 {variable_name} 赋值为 {value}')
+        _run_log.debug('将变量 %s 赋值为 %s', variable_name, value)
         self.env[variable_name] = value
-        clog(f'当前环境: {ld_show(self.env[variable_name])}')
+        _run_log.debug('当前环境: %s', Lazy(ld_show, self.env[variable_name]))
     
     def _execute_tableassign(self, node: ASTNode) -> None:
         """执行Table或列表赋值，如 table[key] = value 或 list[index] = value"""
-        clog('执行Table/List赋值')
+        _run_log.debug('执行Table/List赋值')
         
         # 执行对象表达式
         obj = self._execute_node(node['table'])
@@ -1297,7 +1351,7 @@ class Interpreter:
         if isinstance(obj, EW_Table):
             # Table赋值
             obj[key] = value
-            clog(f'Table赋值: {obj}[{key}] = {value}')
+            _run_log.debug('Table赋值: %s[%s] = %s', obj, key, value)
         elif isinstance(obj, EW_List):
             # 列表赋值
             # 检查索引类型
@@ -1306,16 +1360,16 @@ class Interpreter:
                 return None
             
             # 转换为Python整数索引
-            index = int(key._decimal)
+            index = int(key._num)
             
             # 检查索引范围
-            if index < 0 or index >= len(obj.value):
+            if index < 0 or index >= len(obj):
                 raise_err(EW_RUNTIME_ERROR, f'List index out of range: {index}')
                 return None
             
-            # 执行赋值
-            obj.value[index] = value
-            clog(f'List赋值: {obj}[{index}] = {value}')
+            # 执行赋值（与其他列表共享存储时先复制）
+            obj[index] = value
+            _run_log.debug('List赋值: %s[%s] = %s', obj, index, value)
         else:
             raise_err(EW_RUNTIME_ERROR, f'Expected Table or List, got {type(obj).__name__}')
             return None
@@ -1348,9 +1402,9 @@ class Interpreter:
         # 解析参数 - 直接获取参数列表
         args = [self._execute_node(arg) for arg in node['args']]
         
-        clog(f'调用函数: {func_expr}')
-        clog(f'参数列表: {args} (长度: {len(args)})')
-        clog(f'函数类型: {type(function)}')
+        _run_log.debug('调用函数: %s', func_expr)
+        _run_log.debug('参数列表: %s (长度: %s)', args, len(args))
+        _run_log.debug('函数类型: %s', type(function))
         
         # 执行函数
         if isinstance(function, (EW_Function, EW_MFunction)):
@@ -1363,28 +1417,37 @@ class Interpreter:
             # 参数数量正确，执行自定义函数
             result = self._execute_custom_function(function, args)
         elif callable(function):
-            # 对于内置函数和包函数，仍用 try/except 兜底，但优先检查签名
+            # 内置函数与包函数：按预先计算的参数个数范围检查，然后直接调用底层函数
+            if type(function) is EW_builtins:
+                arity = function.arity
+                target = function.func
+            else:
+                arity = function_arity(function)
+                target = function
+            if arity is not None:
+                least, most = arity
+                got = len(args)
+                if got < least or (most is not None and got > most):
+                    raise_err(EW_RUNTIME_ERROR,
+                              f'The amount of the arguments is not correct: '
+                              f'{arity_message(getattr(target, "__name__", "function"), arity, got)}')
+                    return None
             try:
-                result = function(*args)
+                result = target(*args)
             except TypeError as e:
-                # 仅捕获参数数量不匹配
-                if "takes" in str(e) and "arguments" in str(e):
-                    raise_err(EW_RUNTIME_ERROR,
-                              f'The amount of the arguments is not correct: {e}')
-                else:
-                    raise_err(EW_RUNTIME_ERROR, f'Function calling error: {e}')
+                raise_err(EW_RUNTIME_ERROR, f'Function calling error: {e}')
                 return None
         else:
             # 非可调用对象
             raise_err(EW_RUNTIME_ERROR, f'Literal {function} is not callable')
             return None
 
-        clog(f'函数调用完成: 结果: {result}')
+        _run_log.debug('函数调用完成: 结果: %s', result)
         return result
     
     def _execute_custom_function(self, func: 'EW_Function | EW_MFunction', args: list[Any]) -> Any:
         """执行自定义函数"""
-        clog(f'执行自定义函数: {func}')
+        _run_log.debug('执行自定义函数: %s', func)
         
         # 检查参数数量
         if len(args) != len(func.params):
@@ -1395,25 +1458,28 @@ class Interpreter:
         # 检查是否是记忆化函数
         is_mfunc = isinstance(func, EW_MFunction)
         
-        # 生成缓存键 - 使用对象本身作为哈希键，因为EW_Number已经实现了__hash__方法
-        cache_key = tuple(arg for arg in args)
+        # 生成缓存键 - 参数转换为结构化的原生键（List与Table按内容），无法转换时不使用缓存
+        cache_key = memo_key(args) if is_mfunc else None
         
         # 如果是记忆化函数，检查缓存
-        if is_mfunc and cache_key in func._cache:
-            clog(f'从缓存中获取结果: {func._cache[cache_key]}')
-            return func._cache[cache_key]
+        if cache_key is not None:
+            cached = func._cache.get(cache_key)
+            if cached is not MISSING:
+                _run_log.debug('从缓存中获取结果: %s', cached)
+                # 返回容器的快照，调用者的修改不会影响缓存
+                return detach(cached)
         
         # 创建新的作用域，继承自函数定义时的环境
         new_env = Env()
         # 复制原环境中的所有变量
         for key, value in func.env.vals.items():
             new_env[key] = value
-        clog(f'新建作用域: {new_env}')
+        _run_log.debug('新建作用域: %s', new_env)
         
         # 绑定参数
         for param_name, arg_value in zip(func.params, args):
             new_env[param_name] = arg_value
-            clog(f'绑定参数: {param_name} = {arg_value}')
+            _run_log.debug('绑定参数: %s = %s', param_name, arg_value)
         
         # 在新的作用域中执行函数体
         old_env = self.env
@@ -1440,22 +1506,22 @@ class Interpreter:
             self.env = old_env
         
         # 如果是记忆化函数，缓存结果
-        if is_mfunc:
-            func._cache[cache_key] = result
-            clog(f'缓存结果: {result}')
+        if cache_key is not None:
+            func._cache.put(cache_key, detach(result))
+            _run_log.debug('缓存结果: %s', result)
         
-        clog(f'自定义函数执行完成，结果: {result}')
+        _run_log.debug('自定义函数执行完成，结果: %s', result)
         return result
 
     def _execute_lit(self, node: ASTNode) -> Any:
         """执行字面量"""
-        clog(f'字面量: {node["val"]}')
+        _run_log.debug('字面量: %s', node["val"])
         return node['val']
     
     def _execute_varref(self, node: ASTNode) -> Any:
         """执行变量引用"""
         variable_name = node['name']
-        clog(f'引用变量: {variable_name}')
+        _run_log.debug('引用变量: %s', variable_name)
         
         if variable_name not in self.env:
             # 使用节点中的位置信息调用raise_err
@@ -1466,7 +1532,7 @@ class Interpreter:
                       line=line, code=code, pos=col)
         
         value = self.env[variable_name]
-        clog(f'引用指向的值: {value}')
+        _run_log.debug('引用指向的值: %s', value)
         return value
     
     def _execute_operator(self, node: ASTNode) -> Any:
@@ -1475,7 +1541,7 @@ class Interpreter:
         left_value = self._execute_node(node['left'])
         right_value = self._execute_node(node['right'])
         
-        clog(f'运算符运算: {left_value} {operator} {right_value}')
+        _run_log.debug('运算符运算: %s %s %s', left_value, operator, right_value)
         
         # 手动实现运算逻辑
         result = None
@@ -1487,50 +1553,50 @@ class Interpreter:
                 raise_err(EW_TYPE_ERROR, f'Invalid operand types for {operator}: {type(left_value).__name__} and {type(right_value).__name__}')
                 return None
             
-            # 提取内部Decimal值进行手动运算
-            left_dec = left_value._decimal
-            right_dec = right_value._decimal
+            # 提取内部数值（int、Fraction或Decimal）进行手动运算，整数之间保持int精确运算
+            left_num = left_value._num
+            right_num = right_value._num
             
             match operator:
                 case '+':
-                    result = EW_Number(str(left_dec + right_dec))
+                    result = EW_Number.from_decimal(num_add(left_num, right_num))
                 case '-':
-                    result = EW_Number(str(left_dec - right_dec))
+                    result = EW_Number.from_decimal(num_sub(left_num, right_num))
                 case '*':
-                    result = EW_Number(str(left_dec * right_dec))
+                    result = EW_Number.from_decimal(num_mul(left_num, right_num))
                 case '/':
-                    if right_dec == 0:
+                    if right_num == 0:
                         raise_err(EW_RUNTIME_ERROR, 'Division by zero')
                         return None
-                    result = EW_Number(str(left_dec / right_dec))
+                    result = EW_Number.from_decimal(num_div(left_num, right_num))
                 case '**':
                     # 确保指数是整数
                     if not right_value._isint():
                         raise_err(EW_TYPE_ERROR, f'Exponent must be an integer for {operator}')
                         return None
-                    exponent = int(right_dec)
-                    result = EW_Number(str(left_dec ** exponent))
+                    exponent = int(right_num)
+                    result = EW_Number.from_decimal(num_pow(left_num, exponent))
         
         # 处理比较运算符
         elif operator in ['==', '!=', '<', '>', '<=', '>=']:
             # 支持数值比较
             if isinstance(left_value, EW_Number) and isinstance(right_value, EW_Number):
-                left_dec = left_value._decimal
-                right_dec = right_value._decimal
+                left_num = left_value._num
+                right_num = right_value._num
                 
                 match operator:
                     case '==':
-                        result = EW_Boolean(left_dec == right_dec)
+                        result = EW_Boolean.of(left_num == right_num)
                     case '!=':
-                        result = EW_Boolean(left_dec != right_dec)
+                        result = EW_Boolean.of(left_num != right_num)
                     case '<':
-                        result = EW_Boolean(left_dec < right_dec)
+                        result = EW_Boolean.of(left_num < right_num)
                     case '>':
-                        result = EW_Boolean(left_dec > right_dec)
+                        result = EW_Boolean.of(left_num > right_num)
                     case '<=':
-                        result = EW_Boolean(left_dec <= right_dec)
+                        result = EW_Boolean.of(left_num <= right_num)
                     case '>=':
-                        result = EW_Boolean(left_dec >= right_dec)
+                        result = EW_Boolean.of(left_num >= right_num)
             # 支持布尔值比较
             elif isinstance(left_value, EW_Boolean) and isinstance(right_value, EW_Boolean):
                 left_bool = bool(left_value)
@@ -1538,9 +1604,9 @@ class Interpreter:
                 
                 match operator:
                     case '==':
-                        result = EW_Boolean(left_bool == right_bool)
+                        result = EW_Boolean.of(left_bool == right_bool)
                     case '!=':
-                        result = EW_Boolean(left_bool != right_bool)
+                        result = EW_Boolean.of(left_bool != right_bool)
             # 支持字符串比较
             elif isinstance(left_value, EW_String) and isinstance(right_value, EW_String):
                 left_str = left_value.value
@@ -1548,24 +1614,24 @@ class Interpreter:
                 
                 match operator:
                     case '==':
-                        result = EW_Boolean(left_str == right_str)
+                        result = EW_Boolean.of(left_str == right_str)
                     case '!=':
-                        result = EW_Boolean(left_str != right_str)
+                        result = EW_Boolean.of(left_str != right_str)
                     case '<':
-                        result = EW_Boolean(left_str < right_str)
+                        result = EW_Boolean.of(left_str < right_str)
                     case '>':
-                        result = EW_Boolean(left_str > right_str)
+                        result = EW_Boolean.of(left_str > right_str)
                     case '<=':
-                        result = EW_Boolean(left_str <= right_str)
+                        result = EW_Boolean.of(left_str <= right_str)
                     case '>=':
-                        result = EW_Boolean(left_str >= right_str)
+                        result = EW_Boolean.of(left_str >= right_str)
             else:
                 # 不同类型比较总是False
                 match operator:
                     case '==':
-                        result = EW_Boolean(False)
+                        result = FALSE
                     case '!=':
-                        result = EW_Boolean(True)
+                        result = TRUE
                     case _:
                         raise_err(EW_TYPE_ERROR, f'Cannot compare {type(left_value).__name__} and {type(right_value).__name__} with {operator}')
                         return None
@@ -1578,15 +1644,15 @@ class Interpreter:
                 case 'and':
                     # 短路求值
                     if not left_bool:
-                        result = EW_Boolean(False)
+                        result = FALSE
                     else:
-                        result = EW_Boolean(bool(right_value))
+                        result = EW_Boolean.of(bool(right_value))
                 case 'or':
                     # 短路求值
                     if left_bool:
-                        result = EW_Boolean(True)
+                        result = TRUE
                     else:
-                        result = EW_Boolean(bool(right_value))
+                        result = EW_Boolean.of(bool(right_value))
         
         # 处理字符串拼接（+）
         elif operator == '+' and isinstance(left_value, EW_String) and isinstance(right_value, EW_String):
@@ -1597,12 +1663,12 @@ class Interpreter:
             raise_err(EW_RUNTIME_ERROR, f'Unsupported operator: {operator}')
             return None
         
-        clog(f'运算结果: {result}')
+        _run_log.debug('运算结果: %s', result)
         return result
     
     def _execute_tablelit(self, node: ASTNode) -> 'EW_Table':
         """执行Table字面量，创建EW_Table对象"""
-        clog('执行Table字面量')
+        _run_log.debug('执行Table字面量')
         
         # 创建空Table
         table = EW_Table()
@@ -1616,29 +1682,50 @@ class Interpreter:
             # 添加到Table
             table[key] = value
         
-        clog(f'创建Table: {table}')
+        _run_log.debug('创建Table: %s', table)
         return table
     
     def _execute_listlit(self, node: ASTNode) -> 'EW_List':
         """执行列表字面量，创建EW_List对象"""
-        clog('执行List字面量')
-        
-        # 创建空列表
-        lst = EW_List()
+        _run_log.debug('执行List字面量')
         
         # 执行元素表达式并添加到列表中
+        elements = []
         for element_expr in node['elements']:
             # 执行元素表达式
             element = self._execute_node(element_expr)
             # 添加到列表
-            lst.value.append(element)
+            elements.append(element)
         
-        clog(f'创建List: {lst}')
+        # 创建列表
+        lst = EW_List(elements)
+        
+        _run_log.debug('创建List: %s', lst)
         return lst
     
+    def _execute_memberaccess(self, node: ASTNode) -> Any:
+        """执行点号成员访问，包的成员在访问处缓存"""
+        obj = self._execute_node(node['table'])
+        site = node['site']
+        # 新的访问处尚未缓存包（package为None），不能与求值为None的对象匹配
+        if obj is site.package and obj is not None:
+            return site.value
+        
+        if isinstance(obj, EW_Package):
+            try:
+                value = obj.member(node['member'])
+            except KeyError:
+                raise_err(EW_RUNTIME_ERROR, f'Function {node["member"]} not found in package {obj.name}')
+                return None
+            site.package = obj
+            site.value = value
+            return value
+        
+        return self._access(obj, node['key']['val'])
+    
     def _execute_tableaccess(self, node: ASTNode) -> Any:
         """执行Table、列表或包访问，获取指定键、索引或函数的值"""
-        clog('执行Table/List/Package访问')
+        _run_log.debug('执行Table/List/Package访问')
         
         # 执行对象表达式
         obj = self._execute_node(node['table'])
@@ -1646,7 +1733,11 @@ class Interpreter:
         # 执行键/索引表达式
         key = self._execute_node(node['key'])
         
-        clog(f'访问对象: {obj}, 键/索引: {key}')
+        return self._access(obj, key)
+    
+    def _access(self, obj: Any, key: Any) -> Any:
+        """从Table、列表或包中取得键、索引或函数对应的值"""
+        _run_log.debug('访问对象: %s, 键/索引: %s', obj, key)
         
         # 检查对象类型
         if isinstance(obj, EW_Table):
@@ -1664,14 +1755,14 @@ class Interpreter:
                 return None
             
             # 转换为Python整数索引
-            index = int(key._decimal)
+            index = int(key._num)
             
             # 检查索引范围
-            if index < 0 or index >= len(obj.value):
+            if index < 0 or index >= len(obj):
                 raise_err(EW_RUNTIME_ERROR, f'List index out of range: {index}')
                 return None
             
-            value = obj.value[index]
+            value = obj[index]
         elif isinstance(obj, EW_Package):
             # 包访问
             try:
@@ -1683,8 +1774,35 @@ class Interpreter:
             raise_err(EW_RUNTIME_ERROR, f'Expected Table, List or Package, got {type(obj).__name__}')
             return None
         
-        clog(f'访问结果: {value}')
+        _run_log.debug('访问结果: %s', value)
         return value
+    
+    def _execute_listslice(self, node: ASTNode) -> 'EW_List':
+        """执行列表切片，返回与原列表共享存储的视图"""
+        obj = self._execute_node(node['list'])
+        if not isinstance(obj, EW_List):
+            raise_err(EW_RUNTIME_ERROR, f'Expected List for slicing, got {type(obj).__name__}')
+            return None
+        
+        length = len(obj)
+        bounds = []
+        for expr, default in ((node['start'], 0), (node['stop'], length)):
+            if expr is None:
+                bounds.append(default)
+                continue
+            bound = self._execute_node(expr)
+            if not isinstance(bound, EW_Number) or not bound._isint():
+                raise_err(EW_RUNTIME_ERROR, f'List slice bound must be an integer, got {type(bound).__name__}')
+                return None
+            bounds.append(int(bound._num))
+        
+        start, stop = bounds
+        if start < 0 or stop > length or start > stop:
+            raise_err(EW_RUNTIME_ERROR, f'List slice out of range: {start}:{stop}')
+            return None
+        
+        _run_log.debug('列表切片: [%s:%s]', start, stop)
+        return obj.slice(start, stop)
 
 
 # 全局环境
@@ -1693,7 +1811,7 @@ EW_BUILTINS = Env(
 )
 GENV = EW_BUILTINS
 
-# 自动加载所有包搜索路径下的所有包
+# 注册pack目录下的所有包，包文件在第一次使用时才执行
 auto_load_all_packages()
 
 # 将加载的包添加到全局环境
@@ -1706,16 +1824,24 @@ def parse(tokens: list[Token], code: str = None) -> ASTNodelist:
     return Parser(tokens, code).parse()
 
 
-def run(ast: ASTNodelist, env: Env | None = None) -> Any:
+def run(ast: ASTNodelist, env: Env | None = None, numeric: NumericContext | None = None) -> Any:
     """执行AST (兼容旧接口)"""
-    return Interpreter(env).run(ast)
+    return Interpreter(env, numeric).run(ast)
 
-def directly_run(code):
-    """直接运行代码字符串"""
-    lexer = Lexer()
-    tokens = lexer.tokenize(code)
-    ast = parse(tokens, code)
-    return run(ast)
+def directly_run(code, numeric: NumericContext | None = None, env: Env | None = None):
+    """直接运行代码字符串
+    
+    Args:
+        code: Exwide代码
+        numeric: 数值运算环境，字面量的解析与运算都在该环境下进行
+        env: 全局环境，默认为GENV
+    """
+    numeric = numeric or get_numeric_context()
+    with numeric:
+        lexer = Lexer()
+        tokens = lexer.tokenize(code)
+        ast = parse(tokens, code)
+        return run(ast, env, numeric=numeric)
 
 if __name__ == "__main__":
     code = r'''
@@ -0,0 +1,259 @@
+import gc
+import io
+import json
+import math
+import os
+import select
+import signal
+import socket
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from typing import Any, Dict
+from core.Client import ServerError, parse_address, recv_message, send_message
+from core.Log import get_logger
+
+# 脚本执行服务器：在本地套接字（Unix套接字或本机回环地址上的TCP端口）上接收Exwide脚本源码并执行
+# 服务器没有身份验证，只监听本机；也不接受文件路径，避免借服务器进程的权限读取文件
+#
+# 主进程导入解释器、执行全部包之后预先fork出若干工作进程，工作进程共同在同一个套接字上accept。
+# 每个请求由工作进程再fork出一个子进程执行，子进程对全局环境、包与记忆化缓存的修改随子进程结束而丢弃，
+# 请求之间互不影响；超时后工作进程直接结束子进程。
+# 解析后的AST只在工作进程内存中缓存（最近使用的PARSE_CACHE_SIZE个），请求的源码不写入磁盘上的AST缓存。
+# 通信协议与客户端见core.Client。
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 30.0
+PARSE_CACHE_SIZE = 256  # 每个工作进程在内存中缓存的AST个数
+
+_log = get_logger('server')
+
+
+def _response(status: str, stdout: str = '', result: Any = None, error: str | None = None) -> Dict[str, Any]:
+    return {'status': status, 'stdout': stdout, 'result': result, 'error': error}
+
+
+class ScriptServer:
+    """预先fork工作进程的脚本执行服务器"""
+
+    def __init__(self, address: str, workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT, env=None):
+        """
+        Args:
+            address: 监听地址，格式见parse_address
+            workers: 工作进程个数
+            timeout: 每个请求的超时上限（秒），请求未指定超时时使用
+            env: 执行脚本的全局环境，默认为GENV（例如可以传入从快照读取的环境）
+
+        Raises:
+            ValueError: 工作进程个数或超时不是正数，或地址不是本机地址
+        """
+        if workers < 1:
+            raise ValueError(f'Worker count must be positive, got {workers}')
+        if not math.isfinite(timeout) or timeout <= 0:
+            raise ValueError(f'Timeout must be a positive number of seconds, got {timeout}')
+        parse_address(address)
+        self.address = address
+        self.workers = workers
+        self.timeout = timeout
+        self.env = env
+        self.sock = None
+        self._pids = set()
+        self._parsed = {}  # 工作进程内的AST缓存：(源码, 数值模式, 精度) -> AST
+
+    def warm(self) -> None:
+        """导入解释器并执行全部包，工作进程fork之后直接使用"""
+        from core.Parser import GENV
+        from core.Package import packages
+        if self.env is None:
+            self.env = GENV
+        for name, package in list(packages.items()):
+            try:
+                package.functions
+            except Exception as e:
+                # 无法加载的包留到脚本使用时再报错
+                _log.warning('package %s failed to load: %s', name, e)
+
+    def listen(self) -> None:
+        """创建监听套接字"""
+        family, addr = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            # 上一次运行留下的套接字文件
+            os.unlink(addr)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(addr)
+        self.sock.listen(128)
+
+    def serve_forever(self) -> None:
+        """加载解释器、创建工作进程，之后重新创建意外退出的工作进程，直到收到SIGINT或SIGTERM"""
+        self.warm()
+        self.listen()
+        # 将预热后的对象移出垃圾回收的跟踪，工作进程中的回收不会改写这些页面，fork后尽量共享内存
+        gc.freeze()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        # 在后台启动时SIGINT可能被设为忽略，这里总是以KeyboardInterrupt结束
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            for _ in range(self.workers):
+                self._spawn()
+            _log.info('serving on %s with %s workers', self.address, self.workers)
+            while True:
+                pid, status = os.wait()
+                if pid in self._pids:
+                    self._pids.discard(pid)
+                    _log.warning('worker %s exited with status %s, restarting', pid, status)
+                    self._spawn()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """结束全部工作进程并关闭套接字"""
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._pids.clear()
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            family, addr = parse_address(self.address)
+            if family == socket.AF_UNIX and os.path.exists(addr):
+                os.unlink(addr)
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self._pids.add(pid)
+            return
+        # 工作进程：Ctrl+C由主进程处理，工作进程只由主进程的SIGTERM结束
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self._pids = set()
+        try:
+            while True:
+                conn, _ = self.sock.accept()
+                with conn:
+                    self.handle(conn)
+        finally:
+            os._exit(0)
+
+    def handle(self, conn: socket.socket) -> None:
+        """处理一个连接：读取请求，执行，发送响应"""
+        try:
+            message = recv_message(conn)
+        except (OSError, ServerError) as e:
+            _log.warning('bad request: %s', e)
+            return
+        try:
+            response = self.execute(message)
+        except Exception as e:
+            response = _response('error', error=f'Server error: {e}')
+        try:
+            send_message(conn, response)
+        except OSError:
+            # 客户端已经断开
+            pass
+
+    def execute(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """在工作进程中解析请求的脚本，并在子进程中执行"""
+        from core.Type import DEFAULT_PRECISION, NumericContext
+        try:
+            numeric = NumericContext(message.get('numeric', 'rational'), message.get('precision', DEFAULT_PRECISION))
+        except (TypeError, ValueError) as e:
+            return _response('error', error=str(e))
+        if not isinstance(message.get('code'), str):
+            return _response('error', error='Request needs "code" (the script source)')
+        source = message['code'].encode('utf-8')
+
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                ast = self._parse(source, numeric)
+        except Exception as e:
+            return _response('error', out.getvalue(), error=_describe(e))
+        timeout = self.timeout
+        if message.get('timeout') is not None:
+            requested = message['timeout']
+            if isinstance(requested, bool) or not isinstance(requested, (int, float)) \
+                    or not math.isfinite(requested) or requested <= 0:
+                return _response('error', error=f'Timeout must be a positive number of seconds, got {requested!r}')
+            # 客户端只能缩短超时，不能超过服务器的上限
+            timeout = min(float(requested), self.timeout)
+        return self._fork_run(ast, numeric, str(message.get('stdin', '')), timeout)
+
+    def _parse(self, source: bytes, numeric) -> list:
+        key = (source, numeric.mode, numeric.precision)
+        ast = self._parsed.pop(key, None)
+        if ast is None:
+            from core.Lexer import Lexer
+            from core.Parser import parse
+            code = source.decode('utf-8') + '\n'
+            with numeric:
+                ast = parse(Lexer().tokenize(code), code)
+            if len(self._parsed) >= PARSE_CACHE_SIZE:
+                # 淘汰最久未使用的AST
+                del self._parsed[next(iter(self._parsed))]
+        self._parsed[key] = ast
+        return ast
+
+    def _fork_run(self, ast: list, numeric, stdin: str, timeout: float) -> Dict[str, Any]:
+        """fork子进程执行AST，通过管道取回结果，超时则结束子进程"""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.close(read_fd)
+            try:
+                self._child(ast, numeric, stdin, write_fd, timeout)
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        chunks = []
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    return _response('timeout', error=f'Timed out after {timeout:g} seconds')
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(read_fd)
+        _, status = os.waitpid(pid, 0)
+        if not chunks:
+            return _response('error', error=f'Script process exited with status {status}')
+        return json.loads(b''.join(chunks))
+
+    def _child(self, ast: list, numeric, stdin: str, write_fd: int, timeout: float) -> None:
+        """请求子进程：执行AST，把响应写入管道"""
+        from core.Parser import run
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # 工作进程意外结束时没有人结束子进程，超时后由SIGALRM（默认动作为结束进程）兜底
+        signal.alarm(int(timeout) + 1)
+        sys.stdin = io.StringIO(stdin)
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                value = run(ast, self.env, numeric)
+            response = _response('ok', out.getvalue(), None if value is None else str(value))
+        except BaseException as e:
+            response = _response('error', out.getvalue(), error=_describe(e))
+        data = json.dumps(response).encode('utf-8')
+        while data:
+            data = data[os.write(write_fd, data):]
+        os.close(write_fd)
+
+
+def _describe(error: BaseException) -> str:
+    """异常的简短描述；解释器报错时详细信息已经打印到输出中"""
+    return ''.join(traceback.format_exception_only(error)).strip()
@@ -0,0 +1,75 @@
+from types import FunctionType
+from typing import Any, Callable
+
+# Python可调用对象（内置函数与包函数）的参数个数信息
+#
+# 参数个数表示为(最少, 最多)，最多为None表示接受任意多个参数（*args）。
+# 内置函数在注册时计算，包函数在包导入时计算并保存在函数的ARITY_ATTR属性上，
+# 调用时只需比较两个整数，不再依靠捕获TypeError并检查错误信息来判断参数个数是否正确。
+
+ARITY_ATTR = '__ew_arity__'
+
+_CO_VARARGS = 0x04  # 代码对象标志：函数带有*args
+
+
+def arity_of(func: Callable) -> tuple[int, int | None] | None:
+    """计算可调用对象接受的位置参数个数范围，无法获取签名时返回None"""
+    if type(func) is FunctionType:
+        # 普通Python函数直接读取代码对象，不必导入inspect
+        code = func.__code__
+        if code.co_kwonlyargcount > len(func.__kwdefaults__ or ()):
+            # 必须以关键字传入的参数，Exwide无法提供
+            return None
+        most = code.co_argcount
+        least = most - len(func.__defaults__ or ())
+        return least, None if code.co_flags & _CO_VARARGS else most
+    
+    import inspect
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+    least = 0
+    most = 0
+    for param in signature.parameters.values():
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            most += 1
+            if param.default is param.empty:
+                least += 1
+        elif param.kind is param.VAR_POSITIONAL:
+            most = None
+        elif param.kind is param.KEYWORD_ONLY and param.default is param.empty:
+            return None
+    return least, most
+
+
+def function_arity(func: Callable) -> tuple[int, int | None] | None:
+    """返回函数的参数个数范围，第一次计算后保存在函数上"""
+    arity = getattr(func, ARITY_ATTR, False)
+    if arity is False:
+        arity = arity_of(func)
+        try:
+            setattr(func, ARITY_ATTR, arity)
+        except (AttributeError, TypeError):
+            # 内置方法等对象不能设置属性，每次重新计算
+            pass
+    return arity
+
+
+def arity_message(name: str, arity: tuple[int, int | None], got: int) -> str:
+    """参数个数错误的提示信息"""
+    least, most = arity
+    if most is None:
+        expected = f'at least {least}'
+    elif least == most:
+        expected = str(least)
+    else:
+        expected = f'{least} to {most}'
+    return f'{name}() takes {expected} arguments but {got} {"was" if got == 1 else "were"} given'
+
+
+def annotate(functions: dict[str, Any]) -> None:
+    """为包中的全部函数计算并保存参数个数范围"""
+    for func in functions.values():
+        if callable(func):
+            function_arity(func)
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+import sys
+from core.Env import Env
+
+# 解释器状态快照：将执行完前置代码（prelude）后的全局环境保存到文件，之后的进程直接读取，不必重新执行
+#
+# 快照包含全局环境中的全部变量、用户定义的函数及其AST、记忆化函数缓存的结果。
+# 内置函数只保存名称，包只保存包名与文件路径，读取时重新绑定到当前进程中的对象（包仍然在第一次使用时才执行）。
+#
+# 文件格式：SNAPSHOT_MAGIC，一行头部（快照格式版本、Python版本、解释器源码的哈希），之后是pickle数据。
+# 头部与当前解释器不一致（快照格式改变、换用其他Python版本或修改了解释器）时拒绝读取。
+
+SNAPSHOT_MAGIC = b'EXWIDE-SNAPSHOT\n'
+SNAPSHOT_VERSION = 1
+
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SnapshotError(Exception):
+    """快照无法保存，或与当前解释器不兼容"""
+
+
+def interpreter_build() -> str:
+    """解释器源码（core目录下的全部Python文件）的哈希，解释器被修改后旧快照随之失效"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(_CORE_DIR)):
+        if name.endswith('.py'):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(_CORE_DIR, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _header() -> bytes:
+    python = f'{sys.version_info[0]}.{sys.version_info[1]}'
+    return f'{SNAPSHOT_VERSION} {python} {interpreter_build()}\n'.encode('ascii')
+
+
+def save_snapshot(path: str, env: Env) -> None:
+    """将全局环境保存为快照文件
+
+    Raises:
+        SnapshotError: 环境中有无法保存的值（例如装饰器返回的Python闭包）
+    """
+    try:
+        data = pickle.dumps(env, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise SnapshotError(f'Cannot snapshot interpreter state: {e}') from None
+    # 先写入临时文件再替换，不会留下写了一半的快照
+    temp = f'{path}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(_header())
+        f.write(data)
+    os.replace(temp, path)
+
+
+def load_snapshot(path: str) -> Env:
+    """读取快照文件，返回其中的全局环境
+
+    Raises:
+        SnapshotError: 文件不是快照，或快照与当前解释器不兼容
+        OSError: 文件无法读取
+    """
+    # 先完成内置环境与包的注册，快照中的包绑定到已经注册的包上
+    import core.Parser
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise SnapshotError(f'{path} is not an Exwide snapshot')
+        header = f.readline()
+        if header != _header():
+            raise SnapshotError(f'Snapshot {path} was made by a different interpreter build, recreate it with --snapshot')
+        try:
+            env = pickle.load(f)
+        except Exception as e:
+            raise SnapshotError(f'Snapshot {path} is damaged: {e}') from None
+    if not isinstance(env, Env):
+        raise SnapshotError(f'Snapshot {path} does not contain an environment')
+    return env
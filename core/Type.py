@@ -1,14 +1,82 @@
-from decimal import Decimal, getcontext
+from decimal import Context, Decimal, localcontext
 from fractions import Fraction
+from itertools import islice
 import re
+import sys
 from typing import Any
 from core.Env import Env
-from core.Error import EW_TYPE_ERROR, clog, ld_show
+from core.Error import EW_TYPE_ERROR
+from core.Log import get_logger
 
-# 设置高精度计算环境
-getcontext().prec = 100  # 设置100位精度
+_log = get_logger('type')
+
+# 整数以int精确存储，解除int与字符串互转的位数限制，保证超大整数可以输出
+sys.set_int_max_str_digits(0)
+
+# 数值模式：rational（默认，int/Fraction/Decimal精确优先）、decimal（商使用Decimal近似）、float（使用二进制浮点数）
+NUMERIC_MODES = ('rational', 'decimal', 'float')
+
+# 默认的Decimal精度（有效位数）
+DEFAULT_PRECISION = 100
+
+# 预分配共享实例的小整数范围（闭区间）
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+
+class NumericContext:
+    """数值运算环境，保存数值模式与Decimal精度
+    
+    每个解释器实例持有自己的NumericContext，Decimal运算通过其中的
+    decimal.Context完成，而不是修改全局的getcontext()。
+    作为上下文管理器使用时会将其设为当前环境，并同时进入对应的
+    Decimal局部上下文，使包中的Decimal运算也使用同样的精度。
+    """
+    
+    def __init__(self, mode: str = 'rational', precision: int = DEFAULT_PRECISION):
+        """初始化数值运算环境
+        
+        Args:
+            mode: 数值模式，取值见NUMERIC_MODES
+            precision: Decimal运算的有效位数
+        """
+        if mode not in NUMERIC_MODES:
+            raise ValueError(f"Unknown numeric mode: {mode}")
+        if precision < 1:
+            raise ValueError(f"Precision must be positive, got {precision}")
+        
+        self.mode = mode
+        self.precision = precision
+        self.decimal = Context(prec=precision)
+        self._saved = []  # 进入时保存的上一个环境，支持嵌套使用
+    
+    def __enter__(self):
+        global _numeric
+        local = localcontext(self.decimal)
+        local.__enter__()
+        self._saved.append((_numeric, local))
+        _numeric = self
+        return self
+    
+    def __exit__(self, *exc_info):
+        global _numeric
+        previous, local = self._saved.pop()
+        _numeric = previous
+        local.__exit__(*exc_info)
+    
+    def __repr__(self):
+        return f'<numeric context {self.mode}, precision {self.precision}>'
+
+# 当前生效的数值运算环境
+_numeric = NumericContext()
+
+def get_numeric_context() -> NumericContext:
+    """获取当前生效的数值运算环境"""
+    return _numeric
 
 class EW_Type:
+    # 值类型统一使用__slots__紧凑存储，子类各自声明需要的字段
+    __slots__ = ()
+    
     def __init__(self, value):
         self.value = value
     
@@ -16,7 +84,15 @@ class EW_Type:
         return str(self.value)
 
 class EW_Number(EW_Type):
-    """高精度数字类型，使用Decimal库实现"""
+    """高精度数字类型
+
+    整数使用Python原生int存储（精确且无位数限制），
+    无法整除的商与循环小数使用Fraction精确存储，
+    其余非整数使用Decimal库表示；float模式下非整数使用Python的float
+    """
+    
+    # _num为数值本身；_repr缓存字符串表示：(渲染时的精度, 字符串)，首次输出时才设置
+    __slots__ = ('_num', '_repr')
     
     def __init__(self, value):
         """初始化高精度数字
@@ -24,224 +100,474 @@ class EW_Number(EW_Type):
         Args:
             value: 字符串或数字，表示要创建的高精度数字
         """
+        # 数值直接存储，不经过字符串转换
+        if isinstance(value, (int, Decimal, Fraction)):
+            self._num = _normalize(int(value) if isinstance(value, int) else value)
+            return
+        
+        float_mode = _numeric.mode == 'float'
+        
         # 转换为字符串处理
-        if isinstance(value, (int, float, Decimal)):
+        if isinstance(value, float):
+            if float_mode:
+                self._num = value
+                return
             value = str(value)
         elif not isinstance(value, str):
             raise ValueError(f"Unsupported type for EW_Number: {type(value)}")
         
-        # 保存原始字符串表示，用于检测循环小数
-        self._original_str = value
+        # 整数字面量，使用int存储
+        digits = value[1:] if value[:1] in ('+', '-') else value
+        if digits.isdecimal():
+            self._num = int(value)
+            return
         
-        # 处理循环小数语法，如0.(3)...
-        self._is_repeating = False
-        self._repeating_part = ''
-        
-        # 检查是否是循环小数语法
+        # 循环小数语法，如0.(3)...，转换为精确的有理数
         if '(' in value and ')...' in value:
-            self._is_repeating = True
-            # 提取循环节
-            self._repeating_part = value.split('(')[1].split(')...')[0]
-            # 将循环小数转换为有限小数近似值（使用足够多的位数）
-            # 移除循环小数标记，使用有限部分进行计算
-            finite_part = value.split('(')[0]
-            # 生成足够多的循环节位数用于计算
-            expanded = finite_part
-            if '.' in finite_part:
-                # 扩展循环节到足够的长度
-                expanded = finite_part + self._repeating_part * 20  # 使用20次循环节
-            value = expanded
-        
-        # 使用Decimal库进行高精度计算
-        self._decimal = Decimal(value)
+            number = _normalize(_parse_repeating(value))
+            self._num = float(number) if float_mode and type(number) is not int else number
+            return
+        
+        # 使用Decimal库进行高精度计算，float模式下直接使用float
+        self._num = float(value) if float_mode else Decimal(value)
+    
+    @classmethod
+    def from_decimal(cls, value):
+        """零拷贝构造：直接包装已经计算好的数值
+        
+        不做类型转换、字符串格式化和循环小数解析，供各类运算结果使用
+        
+        Args:
+            value: int、Fraction或Decimal数值（分母为1的Fraction需先化简为int）
+        """
+        # 小整数返回预分配的共享实例
+        if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+            return _small_ints[value - SMALL_INT_MIN]
+        number = object.__new__(cls)
+        number._num = value
+        return number
+    
+    @classmethod
+    def from_literal(cls, text: str) -> 'EW_Number':
+        """从数字字面量构造，小整数返回预分配的共享实例
+        
+        Args:
+            text: 数字字面量字符串
+        """
+        number = cls(text)
+        num = number._num
+        if type(num) is int and SMALL_INT_MIN <= num <= SMALL_INT_MAX:
+            return _small_ints[num - SMALL_INT_MIN]
+        return number
+    
+    def __copy__(self):
+        """数字不可变，复制时返回自身"""
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    @property
+    def _decimal(self):
+        """以Decimal形式获取数值"""
+        num = self._num
+        if isinstance(num, Decimal):
+            return num
+        if isinstance(num, Fraction):
+            return _fraction_to_decimal(num)
+        return Decimal(num)
     
     @property
     def sign(self):
         """获取符号"""
-        return -1 if self._decimal < 0 else 1
+        return -1 if self._num < 0 else 1
     
     @property
     def integer(self):
         """获取整数部分"""
-        return str(abs(int(self._decimal)))
+        return str(abs(int(self._num)))
     
     @property
     def decimal(self):
         """获取小数部分"""
+        if isinstance(self._num, int):
+            return ''
         decimal_str = str(self._decimal)
         if '.' in decimal_str:
             return decimal_str.split('.')[1].rstrip('0')
         return ''
     
     def __repr__(self):
-        """返回数字的字符串表示，智能处理循环小数"""
-        # 检查是否是显式的循环小数
-        if self._is_repeating and self._repeating_part:
-            # 显式循环小数，保持原始格式
-            return self._original_str
-        
-        # 检查是否是整数
-        if self._decimal == int(self._decimal):
-            return str(int(self._decimal))
-        
-        # 转换为字符串
-        num_str = str(self._decimal)
-        
-        # 智能检测循环小数
-        decimal_part = num_str.split('.')[1] if '.' in num_str else ''
-        
-        # 检查是否有循环节（简单实现）
-        if len(decimal_part) > 6:  # 只有小数部分较长时才检查
-            # 尝试检测循环节
-            detected_repeating = self._detect_repeating_part(decimal_part)
-            if detected_repeating:
-                # 找到循环节，返回智能表示
-                integer_part = num_str.split('.')[0]
-                # 找到循环节开始的位置
-                start_pos = decimal_part.find(detected_repeating)
-                if start_pos == 0:
-                    # 循环节从第一位开始
-                    return f"{integer_part}.({detected_repeating})..."
-                else:
-                    # 循环节在小数部分中间开始
-                    non_repeating = decimal_part[:start_pos]
-                    return f"{integer_part}.{non_repeating}({detected_repeating})..."
-        
-        # 普通小数，直接返回
-        return num_str
-    
-    def _detect_repeating_part(self, s):
-        """检测字符串中的循环节
+        """返回数字的字符串表示，智能处理循环小数
         
-        Args:
-            s: 小数部分字符串
-            
-        Returns:
-            str: 循环节，如果没有则返回空字符串
+        数值不可变，渲染结果连同渲染时的精度缓存在实例上，精度不变时直接复用
         """
-        # 只检测长度大于1的字符串
-        if len(s) < 6:  # 需要足够长的字符串才能检测循环节
-            return ''
-        
-        # 尝试不同长度的循环节
-        for i in range(1, min(10, len(s) // 2) + 1):  # 限制循环节最大长度为10
-            # 从字符串末尾开始检查，因为循环小数的末尾应该是完整的循环节
-            for j in range(len(s) - 2 * i, len(s) - i):
-                pattern = s[j:j+i]
-                # 检查是否重复出现
-                if s.endswith(pattern * 2):
-                    return pattern
-        
-        # 检查是否所有字符都相同
-        if len(set(s[-10:])) == 1:  # 检查最后10个字符是否相同
-            return s[-1]
-        
-        return ''
+        precision = _numeric.precision
+        try:
+            cached = self._repr
+        except AttributeError:
+            pass
+        else:
+            if cached[0] == precision:
+                return cached[1]
+        text = _render_number(self._num)
+        self._repr = (precision, text)
+        return text
     
     def __add__(self, other):
-        """高精度加法，使用Decimal库"""
+        """高精度加法，整数之间直接使用int运算"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        result_decimal = self._decimal + other._decimal
-        return EW_Number(result_decimal)
+        return EW_Number.from_decimal(num_add(self._num, other._num))
     
     def __sub__(self, other):
-        """高精度减法，使用Decimal库"""
+        """高精度减法，整数之间直接使用int运算"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        result_decimal = self._decimal - other._decimal
-        return EW_Number(result_decimal)
+        return EW_Number.from_decimal(num_sub(self._num, other._num))
     
     def __mul__(self, other):
-        """高精度乘法，使用Decimal库"""
+        """高精度乘法，整数之间直接使用int运算"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        result_decimal = self._decimal * other._decimal
-        return EW_Number(result_decimal)
+        return EW_Number.from_decimal(num_mul(self._num, other._num))
     
     def __truediv__(self, other):
-        """高精度除法，使用Decimal库"""
+        """高精度除法，能整除时保持整数，否则使用有理数或Decimal库"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        if other._decimal == 0:
+        if other._num == 0:
             raise ZeroDivisionError("Division by zero")
         
-        result_decimal = self._decimal / other._decimal
-        return EW_Number(result_decimal)
+        return EW_Number.from_decimal(num_div(self._num, other._num))
     
     def __eq__(self, other):
         """相等比较"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        return EW_Boolean(self._decimal == other._decimal)
+        return EW_Boolean.of(self._num == other._num)
     
     def __lt__(self, other):
         """小于比较"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        return EW_Boolean(self._decimal < other._decimal)
+        return EW_Boolean.of(self._num < other._num)
     
     def __gt__(self, other):
         """大于比较"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        return EW_Boolean(self._decimal > other._decimal)
+        return EW_Boolean.of(self._num > other._num)
     
     def __le__(self, other):
         """小于等于比较"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        return EW_Boolean(self._decimal <= other._decimal)
+        return EW_Boolean.of(self._num <= other._num)
     
     def __ge__(self, other):
         """大于等于比较"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
-        return EW_Boolean(self._decimal >= other._decimal)
+        return EW_Boolean.of(self._num >= other._num)
     
     def __hash__(self):
-        """哈希方法，使EW_Number对象可哈希"""
-        return hash(self._decimal)
+        """哈希方法，使EW_Number对象可哈希（int与Decimal的哈希值一致）"""
+        return hash(self._num)
     
     def _isint(self) -> bool:
-        """检查是否为整数"""
-        return self._decimal == int(self._decimal)
+        """检查是否为整数（Fraction总是已化简的非整数）"""
+        num = self._num
+        if isinstance(num, float):
+            return num.is_integer()
+        return isinstance(num, int) or (isinstance(num, Decimal) and num == int(num))
     
     def __pow__(self, other):
-        """高精度幂运算，使用Decimal库"""
+        """高精度幂运算，整数底数与非负整数指数时结果精确"""
         if not isinstance(other, EW_Number):
             return NotImplemented
         
         if not other._isint():
             raise ValueError("Power must be an integer")
         
-        exponent = int(other._decimal)
-        result_decimal = self._decimal ** exponent
-        return EW_Number(result_decimal)
+        return EW_Number.from_decimal(num_pow(self._num, int(other._num)))
     
     def copy(self):
         """创建副本"""
-        return EW_Number(self._decimal)
+        return EW_Number.from_decimal(self._num)
+
+def _normalize(value):
+    """将分母为1的Fraction化简为int，保证整数始终使用int表示"""
+    if type(value) is Fraction and value.denominator == 1:
+        return value.numerator
+    return value
+
+def _fraction_to_decimal(value: Fraction) -> Decimal:
+    """将有理数按当前精度转换为Decimal"""
+    return _numeric.decimal.divide(Decimal(value.numerator), value.denominator)
+
+def _coerce(left, right):
+    """统一混合运算的操作数类型
+    
+    float模式下所有非整数都转换为float；
+    其余模式下，有限的Decimal本身就是精确的有理数，与Fraction混合运算时转换为Fraction，
+    只有无穷大与NaN才将Fraction转换为Decimal
+    """
+    left_type, right_type = type(left), type(right)
+    if left_type is right_type:
+        return left, right
+    if _numeric.mode == 'float':
+        if left_type is not int:
+            left = float(left)
+        if right_type is not int:
+            right = float(right)
+        return left, right
+    if left_type is Fraction and right_type is Decimal:
+        if right.is_finite():
+            return left, Fraction(right)
+        return _fraction_to_decimal(left), right
+    if right_type is Fraction and left_type is Decimal:
+        if left.is_finite():
+            return Fraction(left), right
+        return left, _fraction_to_decimal(right)
+    return left, right
+
+def num_add(left, right):
+    """数值加法"""
+    if type(left) is int and type(right) is int:
+        return left + right
+    left, right = _coerce(left, right)
+    if type(left) is Decimal or type(right) is Decimal:
+        return _numeric.decimal.add(left, right)
+    return _normalize(left + right)
+
+def num_sub(left, right):
+    """数值减法"""
+    if type(left) is int and type(right) is int:
+        return left - right
+    left, right = _coerce(left, right)
+    if type(left) is Decimal or type(right) is Decimal:
+        return _numeric.decimal.subtract(left, right)
+    return _normalize(left - right)
+
+def num_mul(left, right):
+    """数值乘法"""
+    if type(left) is int and type(right) is int:
+        return left * right
+    left, right = _coerce(left, right)
+    if type(left) is Decimal or type(right) is Decimal:
+        return _numeric.decimal.multiply(left, right)
+    return _normalize(left * right)
+
+def num_div(left, right):
+    """数值除法：两个整数能整除时结果仍为int，否则按数值模式得到有理数、Decimal或float
+    
+    Args:
+        left: 被除数（int、Fraction、Decimal或float）
+        right: 除数（int、Fraction、Decimal或float），调用方需保证不为0
+    """
+    if type(left) is int and type(right) is int:
+        if left % right == 0:
+            return left // right
+        mode = _numeric.mode
+        if mode == 'rational':
+            return Fraction(left, right)
+        if mode == 'float':
+            return left / right
+        return _numeric.decimal.divide(Decimal(left), right)
+    left, right = _coerce(left, right)
+    if type(left) is Decimal or type(right) is Decimal:
+        return _numeric.decimal.divide(left, right)
+    if type(left) is Fraction or type(right) is Fraction:
+        return _normalize(Fraction(left) / right)
+    return left / right
+
+def num_pow(base, exponent: int):
+    """数值幂运算：int与Fraction底数配合整数指数时精确计算，不受精度限制
+    
+    Args:
+        base: 底数（int、Fraction、Decimal或float）
+        exponent: 整数指数
+    """
+    base_type = type(base)
+    if base_type is int and exponent >= 0:
+        return base ** exponent
+    mode = _numeric.mode
+    if base_type is float or mode == 'float':
+        negative = base < 0 and exponent % 2
+        try:
+            fbase = float(base)
+        except OverflowError:
+            # 底数（很大的整数或分数）超出浮点数范围：负指数时结果趋近于0，正指数时为无穷大
+            if exponent == 0:
+                return 1.0
+            if exponent < 0:
+                return -0.0 if negative else 0.0
+            return float('-inf') if negative else float('inf')
+        try:
+            return fbase ** exponent
+        except OverflowError:
+            # 与浮点数乘法溢出一致，结果为无穷大（负指数时|底数|<1）
+            return float('-inf') if negative else float('inf')
+    if base_type is Fraction or mode == 'rational':
+        return _normalize(Fraction(base) ** exponent)
+    return _numeric.decimal.power(Decimal(base), exponent)
+
+# Decimal小数部分中检测的循环节最大长度
+_MAX_CYCLE = 10
+
+def _render_number(num) -> str:
+    """将数值渲染为Exwide的字符串表示
+    
+    Args:
+        num: int、Fraction、Decimal或float数值
+    """
+    # 整数直接输出
+    if isinstance(num, int):
+        return str(num)
+    
+    # 有理数根据分母精确地输出循环小数
+    if isinstance(num, Fraction):
+        return _render_fraction(num)
+    
+    # 二进制浮点数，整数值按整数输出
+    if isinstance(num, float):
+        if num.is_integer():
+            return str(int(num))
+        return repr(num)
+    
+    # 整数值的Decimal按整数输出
+    if num == num.to_integral_value():
+        return str(int(num))
+    
+    num_str = str(num)
+    integer_part, _, decimal_part = num_str.partition('.')
+    
+    # 只有小数部分较长时才检测循环节
+    if len(decimal_part) > 6:
+        start, length = _detect_repeating(decimal_part)
+        if length:
+            non_repeating = decimal_part[:start]
+            repeating = decimal_part[start:start + length]
+            return f"{integer_part}.{non_repeating}({repeating})..."
+    
+    # 普通小数，直接返回
+    return num_str
+
+def _detect_repeating(digits: str) -> tuple[int, int]:
+    """检测小数部分末尾的循环节
+    
+    末尾完整重复至少两次的最短片段（长度不超过_MAX_CYCLE）视为循环节，
+    再从末尾向前逐位比较，找到循环开始的位置，整体时间复杂度为O(n)。
+    
+    Args:
+        digits: 小数部分字符串
+        
+    Returns:
+        tuple: (循环开始的位置, 循环节长度)，没有循环节时长度为0
+    """
+    n = len(digits)
+    for length in range(1, min(_MAX_CYCLE, n // 2) + 1):
+        if digits[n - 2 * length:n - length] == digits[n - length:]:
+            break
+    else:
+        return 0, 0
+    
+    # 每一位都与其后一个循环节处的位相同时，说明仍在循环之中
+    start = n - 2 * length
+    while start > 0 and digits[start - 1] == digits[start - 1 + length]:
+        start -= 1
+    return start, length
+
+def _parse_repeating(value: str) -> Fraction:
+    """将循环小数字面量（如1.2(34)...）解析为精确的有理数
+    
+    Args:
+        value: 循环小数字符串，格式为 整数部分.非循环部分(循环节)...
+    """
+    negative = value.startswith('-')
+    body = value.lstrip('+-')
+    head, cycle = body.split('(')
+    cycle = cycle.split(')...')[0]
+    integer_part, _, fixed_part = head.partition('.')
+    
+    # 0.A(R)... = (A * (10^r - 1) + R) / ((10^r - 1) * 10^a)
+    nines = 10 ** len(cycle) - 1
+    numerator = int(fixed_part or '0') * nines + int(cycle)
+    result = int(integer_part or '0') + Fraction(numerator, nines * 10 ** len(fixed_part))
+    return -result if negative else result
+
+def _render_fraction(value: Fraction) -> str:
+    """根据分母精确渲染有理数，循环小数输出为 整数部分.非循环部分(循环节)... 的形式
+    
+    非循环部分的长度由分母中因子2和5的个数决定，循环节通过长除法得到，
+    时间复杂度为O(循环节长度)。若总位数超过当前精度，则按Decimal输出近似值。
+    """
+    sign = '-' if value < 0 else ''
+    numerator, denominator = abs(value.numerator), value.denominator
+    integer_part, remainder = divmod(numerator, denominator)
+    
+    # 分母去掉因子2和5后，非循环部分的长度为两者个数的较大值
+    rest = denominator
+    twos = fives = 0
+    while rest % 2 == 0:
+        rest //= 2
+        twos += 1
+    while rest % 5 == 0:
+        rest //= 5
+        fives += 1
+    fixed_len = max(twos, fives)
+    limit = _numeric.precision
+    
+    # 非循环部分
+    fixed_digits = []
+    for _ in range(min(fixed_len, limit)):
+        remainder *= 10
+        digit, remainder = divmod(remainder, denominator)
+        fixed_digits.append(str(digit))
+    
+    if rest == 1:
+        # 有限小数
+        if fixed_len <= limit:
+            return f"{sign}{integer_part}.{''.join(fixed_digits)}"
+        return str(_fraction_to_decimal(value))
+    
+    # 循环部分：余数回到起点时循环结束
+    start = remainder
+    cycle_digits = []
+    while True:
+        remainder *= 10
+        digit, remainder = divmod(remainder, denominator)
+        cycle_digits.append(str(digit))
+        if remainder == start:
+            break
+        if fixed_len + len(cycle_digits) >= limit:
+            # 循环节过长，输出当前精度下的近似值
+            return str(_fraction_to_decimal(value))
+    
+    return f"{sign}{integer_part}.{''.join(fixed_digits)}({''.join(cycle_digits)})..."
 
 class EW_String(EW_Type):
+    __slots__ = ('value',)
+    
     def __init__(self, value, without_quote=True):
-        clog(f'EW_String init: value: {value}, without_quote: {without_quote}')
+        _log.debug('EW_String init: value: %s, without_quote: %s', value, without_quote)
         if without_quote:
-            clog(f"Removed quotes from string: {value}")
+            _log.debug("Removed quotes from string: %s", value)
             self.value = value[1:-1]  # 舍弃左右的引号
-            clog(f'After, string: {self.value}')
+            _log.debug('After, string: %s', self.value)
         else:
             self.value = value
-            clog(f"String: {self.value}")
+            _log.debug("String: %s", self.value)
 
     def __add__(self, other):
         if isinstance(other, EW_String):
@@ -275,10 +601,24 @@ class EW_String(EW_Type):
         return not self.__eq__(other)
     
     def __hash__(self):
-        return hash((self.value, type(self)))
+        # 与__eq__一致：EW_String与同内容的str相等，哈希值也相同（str会缓存自己的哈希值）
+        return hash(self.value)
 
 
 class EW_Boolean(EW_Type):
+    """布尔类型，运算结果统一使用TRUE与FALSE两个单例"""
+    
+    __slots__ = ('value',)
+    
+    @classmethod
+    def of(cls, value) -> 'EW_Boolean':
+        """获取与value真值相同的布尔单例
+        
+        Args:
+            value: 任意可以转换为bool的值
+        """
+        return TRUE if value else FALSE
+    
     def __repr__(self):
         return "true" if self.value else "false"
     
@@ -286,14 +626,45 @@ class EW_Boolean(EW_Type):
         return bool(self.value)
     
     def __eq__(self, other):
-        return EW_Boolean(self.value == other.value)
+        if not isinstance(other, EW_Boolean):
+            return NotImplemented
+        return EW_Boolean.of(self.value == other.value)
 
     def __ne__(self, other):
-        return EW_Boolean(self.value != other.value)
+        if not isinstance(other, EW_Boolean):
+            return NotImplemented
+        return EW_Boolean.of(self.value != other.value)
+    
+    def __hash__(self):
+        # 与数字0和1的哈希值区分，布尔值作为键时不会与数字冲突
+        return _BOOLEAN_HASHES[bool(self.value)]
+    
+    def __copy__(self):
+        """布尔值不可变，复制时返回单例自身"""
+        return self
+    
+    def __reduce__(self):
+        # 反序列化时还原为单例
+        return (EW_Boolean.of, (bool(self.value),))
+    
+    def __deepcopy__(self, memo):
+        return self
+
+# 布尔值的哈希值
+_BOOLEAN_HASHES = (hash(('EW_Boolean', False)), hash(('EW_Boolean', True)))
+
+# 布尔单例
+TRUE = EW_Boolean(True)
+FALSE = EW_Boolean(False)
+
+# 预分配的小整数实例，下标为 数值 - SMALL_INT_MIN
+_small_ints = [EW_Number(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
 
 class EW_Function:
     """函数类型"""
     
+    __slots__ = ('params', 'body', 'env', 'name')
+    
     def __init__(self, params: list[str], body: list[dict[str, Any]], env: Env, name: str = "do_func"):
         self.params = params
         self.body = body
@@ -313,12 +684,17 @@ class EW_Function:
 class EW_MFunction:
     """记忆化函数类型"""
     
-    def __init__(self, params: list[str], body: list[dict[str, Any]], env: Env, name: str = "mfunc"):
+    __slots__ = ('params', 'body', 'env', 'name', '_cache')
+    
+    def __init__(self, params: list[str], body: list[dict[str, Any]], env: Env, name: str = "mfunc", cache=None):
         self.params = params
         self.body = body
         self.env = env
         self.name = name  # 记忆化函数名称
-        self._cache = {}  # 记忆化缓存
+        if cache is None:
+            from core.Memo import MemoCache  # core.Memo依赖本模块，在此处导入
+            cache = MemoCache()
+        self._cache = cache  # 记忆化缓存（core.Memo.MemoCache）
     
     def __call__(self, *args):
         # 函数调用逻辑将在解释器中实现
@@ -331,7 +707,21 @@ class EW_MFunction:
         return self.__str__()
 
 class EW_Table(EW_Type):
-    """Table数据类型，支持键值对存储和混合类型键"""
+    """Table数据类型，支持键值对存储和混合类型键
+    
+    与Lua的table类似分为两部分：键为0..n-1的连续非负整数时，值按下标存放在
+    Python列表_array中（数组部分），其余键值对存放在字典_hash中（哈希部分）。
+    写入紧接数组末尾的键时追加到数组部分，并把哈希部分中随后连续的整数键一并迁移过来。
+    键先经table_key()转换为原生值再存放，查找时不会调用EW_类型的__hash__与__eq__。
+    
+    snapshot()得到深拷贝：其中的Table/List立即取各自的快照（外部可能还持有它们的引用），
+    不含容器的数组部分或哈希部分由双方共享并都标记为_snapshot，任何一方修改前先浅复制（写时复制）。
+    取快照要检查每个元素的类型，因此是O(n)的；嵌套的Table/List也不是写时复制，
+    所有层的容器都在取快照时复制，耗时与嵌套数据的总大小成正比。
+    """
+    
+    # _fingerprint缓存记忆化使用的结构化指纹（见core.Memo），修改时清除
+    __slots__ = ('_array', '_hash', '_snapshot', '_fingerprint')
     
     def __init__(self, value=None):
         """初始化Table对象
@@ -339,13 +729,15 @@ class EW_Table(EW_Type):
         Args:
             value: 可选的初始键值对字典
         """
-        # 使用字典存储键值对，确保键的类型安全
-        self._data = {}
+        self._array = []  # 数组部分：下标即键
+        self._hash = {}   # 哈希部分：其余的键
+        self._snapshot = False
+        self._fingerprint = None
         
         # 如果提供了初始值，添加到Table中
         if value:
             for key, val in value.items():
-                self._data[key] = val
+                self[key] = val
     
     def __getitem__(self, key):
         """通过键获取值
@@ -359,9 +751,10 @@ class EW_Table(EW_Type):
         Raises:
             KeyError: 如果键不存在
         """
-        clog(f'Getting table[{[key, type(key).__name__]}]')
-        clog(f'now table data: {ld_show([(k, type(k).__name__, v, type(v).__name__) for k, v in self._data.items()])}')
-        return self._data[key]
+        key = table_key(key)
+        if type(key) is int and 0 <= key < len(self._array):
+            return self._array[key]
+        return self._hash[key]
     
     def __setitem__(self, key, value):
         """设置键值对
@@ -370,12 +763,84 @@ class EW_Table(EW_Type):
             key: 键，可以是字符串或数字
             value: 值
         """
-        self._data[key] = value
+        if self._snapshot:
+            self._own()
+        self._fingerprint = None
+        array = self._array
+        key = table_key(key)
+        if type(key) is not int or key < 0 or key > len(array):
+            self._hash[key] = value
+        elif key < len(array):
+            array[key] = value
+        else:
+            array.append(value)
+            if self._hash:
+                self._migrate()
+    
+    def _migrate(self):
+        """将哈希部分中紧接数组末尾的连续整数键迁移到数组部分"""
+        array = self._array
+        hash_part = self._hash
+        while hash_part:
+            value = hash_part.pop(len(array), _MISSING)
+            if value is _MISSING:
+                break
+            array.append(value)
+    
+    def items(self):
+        """依次产生(键, 值)，先数组部分后哈希部分，不触发复制"""
+        for index, value in enumerate(self._array):
+            yield EW_Number.from_decimal(index), value
+        for key, value in self._hash.items():
+            yield _key_value(key), value
+    
+    def __len__(self):
+        return len(self._array) + len(self._hash)
+    
+    def __bool__(self):
+        # 与其他值类型一致，空Table同样为真
+        return True
+    
+    def snapshot(self, memo: dict | None = None) -> 'EW_Table':
+        """返回深拷贝快照，O(n)：检查每个元素，嵌套的Table/List立即递归取快照，
+        只有不含Table/List的部分推迟到修改时才复制
+        
+        Args:
+            memo: 已经取过快照的容器（id -> 快照），保持共享引用与循环引用的结构
+        """
+        if memo is None:
+            memo = {}
+        copy = memo.get(id(self))
+        if copy is not None:
+            return copy
+        copy = object.__new__(EW_Table)
+        memo[id(self)] = copy
+        copy._fingerprint = None
+        array = self._array
+        if _has_containers(array):
+            array = [value.snapshot(memo) if isinstance(value, _CONTAINERS) else value for value in array]
+        hash_part = self._hash
+        if _has_containers(hash_part.values()):
+            hash_part = {key: value.snapshot(memo) if isinstance(value, _CONTAINERS) else value
+                         for key, value in hash_part.items()}
+        copy._array = array
+        copy._hash = hash_part
+        copy._snapshot = array is self._array or hash_part is self._hash
+        if copy._snapshot:
+            self._snapshot = True
+        return copy
+    
+    def _own(self):
+        """复制出独占的存储（共享的部分中没有Table/List，浅复制即可）"""
+        self._array = self._array[:]
+        self._hash = self._hash.copy()
+        self._snapshot = False
+        self._fingerprint = None
     
     def __repr__(self):
         """返回Table的字符串表示"""
         items = []
-        for key, value in self._data.items():
+        for key, value in self.items():
             if isinstance(key, str):
                 # 字符串键添加引号
                 items.append(f'"{key}": {value}')
@@ -384,15 +849,148 @@ class EW_Table(EW_Type):
                 items.append(f'{key}: {value}')
         return f'{{{", ".join(items)}}}'
 
+# 哈希部分中不存在的键
+_MISSING = object()
+
+def table_key(value):
+    """将值转换为Table与记忆化缓存使用的原生键
+    
+    数字转换为int、Fraction、Decimal或float（整数值统一为int），字符串转换为str，
+    布尔值转换为TRUE/FALSE单例（与数字1和0区分），其余值按对象本身作为键。
+    """
+    cls = type(value)
+    if cls is EW_String:
+        return value.value
+    if cls is EW_Number:
+        num = value._num
+        if type(num) is int:
+            return num
+        if isinstance(num, float):
+            return int(num) if num.is_integer() else num
+        if type(num) is Decimal and num.is_finite() and num == num.to_integral_value():
+            return int(num)
+        return num
+    if cls is EW_Boolean:
+        return TRUE if value.value else FALSE
+    return value
+
+def _key_value(key):
+    """table_key()的逆转换，将原生键还原为Exwide的值"""
+    if isinstance(key, str):
+        return EW_String(key, without_quote=False)
+    if isinstance(key, (int, Fraction, Decimal, float)):
+        return EW_Number.from_decimal(key)
+    return key
+
 class EW_List(EW_Type):
+    """列表类型，切片得到与原列表共享存储的视图
+    
+    元素存放在_items[_start:_stop]中（_stop为None表示到末尾）。
+    切片时原列表与视图共享同一个_items并都标记为_shared，
+    任何一方被修改前先复制出自己的那一段（写时复制），因此切片是O(1)的。
+    snapshot()得到深拷贝：要检查每个元素（O(n)），没有Table/List元素时与切片一样共享存储，
+    否则复制元素列表并立即为每个容器元素取快照。
+    """
+    
+    # _fingerprint缓存记忆化使用的结构化指纹（见core.Memo），修改时清除
+    __slots__ = ('_items', '_start', '_stop', '_shared', '_fingerprint')
+    
     def __init__(self, invalue=None):
-        self.value = []
-        if invalue:
-            for item in invalue:
-                self.value.append(item)
+        self._items = list(invalue) if invalue else []
+        self._start = 0
+        self._stop = None
+        self._shared = False
+        self._fingerprint = None
+    
+    @property
+    def value(self) -> list:
+        """可以原地修改的元素列表，与其他列表共享存储时先复制"""
+        self._fingerprint = None
+        if self._shared or self._start or self._stop is not None:
+            self.value = self._items[self._start:self._stop]
+        return self._items
+    
+    @value.setter
+    def value(self, items: list):
+        self._items = items
+        self._start = 0
+        self._stop = None
+        self._shared = False
+        self._fingerprint = None
+    
+    def slice(self, start: int, stop: int) -> 'EW_List':
+        """返回[start, stop)范围的视图，不复制元素
+        
+        Args:
+            start: 起始下标（包含），需满足0 <= start <= stop
+            stop: 结束下标（不包含），需满足stop <= len(self)
+        """
+        view = object.__new__(EW_List)
+        view._items = self._items
+        view._start = self._start + start
+        view._stop = self._start + stop
+        view._shared = True
+        view._fingerprint = None
+        self._shared = True
+        return view
+    
+    def snapshot(self, memo: dict | None = None) -> 'EW_List':
+        """返回深拷贝快照，O(n)：没有Table/List元素时共享存储，否则立即递归为容器元素取快照
+        
+        Args:
+            memo: 已经取过快照的容器（id -> 快照），保持共享引用与循环引用的结构
+        """
+        if memo is None:
+            memo = {}
+        copy = memo.get(id(self))
+        if copy is not None:
+            return copy
+        if not _has_containers(self._elements()):
+            copy = memo[id(self)] = self.slice(0, len(self))
+            return copy
+        copy = memo[id(self)] = EW_List()
+        copy._items = [item.snapshot(memo) if isinstance(item, _CONTAINERS) else item for item in self._elements()]
+        return copy
+    
+    def to_list(self) -> list:
+        """返回元素的Python列表副本"""
+        return self._items[self._start:self._stop]
+    
+    def __len__(self):
+        if self._stop is None:
+            return len(self._items) - self._start
+        return self._stop - self._start
+    
+    def __bool__(self):
+        # 与其他值类型一致，空列表同样为真
+        return True
+    
+    def __getitem__(self, index: int):
+        """按下标读取元素，下标需在[0, len(self))范围内"""
+        return self._items[self._start + index]
+    
+    def __setitem__(self, index: int, item):
+        self.value[index] = item
+    
+    def __iter__(self):
+        return self._elements()
+    
+    def _elements(self):
+        """只读地遍历元素，不触发复制"""
+        if self._start or self._stop is not None:
+            return islice(self._items, self._start, self._stop)
+        return iter(self._items)
     
     def __repr__(self):
-        return '[' + ', '.join([str(i) for i in self.value]) + ']'
+        return '[' + ', '.join([str(i) for i in self._elements()]) + ']'
+
+# 需要写时复制的容器类型
+_CONTAINERS = (EW_Table, EW_List)
+_CONTAINER_TYPES = frozenset(_CONTAINERS)
+
+def _has_containers(values) -> bool:
+    """values中是否有Table/List（容器类型没有子类，按类型比较，整个循环在C中完成）"""
+    return not _CONTAINER_TYPES.isdisjoint(map(type, values))
 
 if __name__ == "__main__":
     # 获取当前文件所在目录的父目录（即项目根目录）
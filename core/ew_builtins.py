@@ -1,13 +1,26 @@
 from core.Type import *
-from core.Error import clog
+from core.Error import raise_err
+from core.Log import get_logger
+from core.Signature import arity_of
 from typing import TypeVar
 
+_log = get_logger('builtin')
+
 class EW_builtins:
+    """内置函数，注册时计算参数个数范围(最少, 最多)，解释器据此检查参数后直接调用func"""
+    
+    __slots__ = ('func', 'arity')
+    
     def __init__(self, func):
         self.func = func
+        self.arity = arity_of(func)
+    
+    def __reduce__(self):
+        # 快照中只保存名称，读取时绑定到当前进程中的内置函数
+        return (get_builtin, (self.func.__name__,))
     
     def __call__(self, *args):
-        clog(f'{self.func.__name__} args: {args}')
+        _log.debug('%s args: %s', self.func.__name__, args)
         return self.func(*args)
     
     def __repr__(self):
@@ -15,6 +28,10 @@ class EW_builtins:
 
 ew_builtins = {}
 
+def get_builtin(name):
+    """按名称取得内置函数"""
+    return ew_builtins[name]
+
 def reg_builtin(name=None):
     def decorator(func):
         global ew_builtins
@@ -43,6 +60,27 @@ def help():
 def copyright():
     return EW_String('Exwide Interpreter (c) 2025 CGrakeski', without_quote=False)
 
+@reg_builtin('len')
+def ew_len(x) -> EW_Number:
+    if isinstance(x, EW_List):
+        return EW_Number.from_decimal(len(x))
+    if isinstance(x, EW_String):
+        return EW_Number.from_decimal(len(x.value))
+    if isinstance(x, EW_Table):
+        return EW_Number.from_decimal(len(x))
+    raise_err(EW_TYPE_ERROR, f'Object of type {type(x).__name__} has no len()')
+
+@reg_builtin('memo_stats')
+def memo_stats(func) -> EW_Table:
+    if not isinstance(func, EW_MFunction):
+        raise_err(EW_TYPE_ERROR, f'Expected a memoized function, got {type(func).__name__}')
+    stats = EW_Table()
+    for key, value in func._cache.stats().items():
+        # 未设置的容量与过期时间不列出
+        if value is not None:
+            stats[EW_String(key, without_quote=False)] = EW_Number(value)
+    return stats
+
 @reg_builtin('type')
 def typeof(x):
     return type(x).__name__
@@ -57,11 +95,13 @@ def ew_input() -> EW_String:
     return EW_String(inputs, without_quote=False)
 
 T = TypeVar('T', bound = EW_Type)
-from copy import deepcopy
 
 @reg_builtin('copy')
 def ew_copy(x: T) -> T:
-    return deepcopy(x)
+    # Table与List返回快照（O(n)，嵌套的容器立即复制，见EW_Table.snapshot），其余值不可变，直接共享
+    if isinstance(x, (EW_Table, EW_List)):
+        return x.snapshot()
+    return x
 
 if __name__ == '__main__':
     print(ew_builtins)
@@ -4,7 +4,9 @@
 import os
 import sys
 
-from core.Type import EW_Function, EW_MFunction
+from core.Type import EW_Function, EW_MFunction, EW_Number
+from core.Error import raise_err, EW_TYPE_ERROR
+from core.Memo import MemoCache
 
 packall = {}
 
@@ -46,3 +48,105 @@ def memoi(func):
     else:
         # 其他类型，返回原函数
         return func
+
+
+def _memoize(func, cache: MemoCache):
+    """将函数转换为使用指定缓存的记忆化函数，已经是记忆化函数时替换其缓存"""
+    if isinstance(func, EW_Function):
+        return EW_MFunction(func.params, func.body, func.env, func.name, cache)
+    elif isinstance(func, EW_MFunction):
+        func._cache = cache
+        return func
+    else:
+        raise_err(EW_TYPE_ERROR, f'Cannot memoize {type(func).__name__}')
+
+
+def _positive(value, what: str):
+    """检查参数是正数，返回对应的Python数值"""
+    if not isinstance(value, EW_Number) or value._num <= 0:
+        raise_err(EW_TYPE_ERROR, f'{what} must be a positive number, got {value}')
+    return value._num
+
+
+def _size(value) -> int:
+    """检查缓存容量是不小于1的整数，返回对应的int"""
+    if not isinstance(value, EW_Number) or not value._isint() or value._num < 1:
+        raise_err(EW_TYPE_ERROR, f'Cache size must be an integer of at least 1, got {value}')
+    return int(value._num)
+
+
+@pack_register
+def lru(maxsize, ttl=None):
+    """带容量上限的记忆化装饰器，超出时淘汰最久未使用的结果
+    
+    用法：deco.lru(1000) func f(n) { ... }，也可以用于mfunc
+    
+    Args:
+        maxsize: 最多缓存的结果个数
+        ttl: 可选，结果的有效时间（秒）
+    
+    Returns:
+        装饰器
+    """
+    size = _size(maxsize)
+    seconds = float(_positive(ttl, 'Cache TTL')) if ttl is not None else None
+    
+    def decorator(func):
+        return _memoize(func, MemoCache(size, seconds))
+    return decorator
+
+
+@pack_register
+def ttl(seconds):
+    """带过期时间的记忆化装饰器，缓存的结果在指定秒数后失效
+    
+    用法：deco.ttl(60) func f(n) { ... }
+    
+    Args:
+        seconds: 结果的有效时间（秒）
+    
+    Returns:
+        装饰器
+    """
+    seconds = float(_positive(seconds, 'Cache TTL'))
+    
+    def decorator(func):
+        return _memoize(func, MemoCache(ttl=seconds))
+    return decorator
+
+
+@pack_register
+def persist(maxsize=None):
+    """持久化的记忆化装饰器，结果保存在缓存目录的SQLite数据库中，下次运行时仍然有效
+    
+    用法：deco.persist() func f(n) { ... } 或 deco.persist(10000) func f(n) { ... }
+    结果按脚本区分，并随函数体读取的全局变量的值区分；函数体改变后，之前保存的结果自动失效。
+    
+    Args:
+        maxsize: 可选，最多保存的结果个数（内存与磁盘分别计算）
+    
+    Returns:
+        装饰器
+    """
+    # 只在使用persist时导入持久化存储（sqlite3等），只使用lru/ttl的脚本不必加载
+    from core.MemoStore import MemoStore, PersistentMemoCache, function_hash
+    size = _size(maxsize) if maxsize is not None else None
+    
+    def decorator(func):
+        if not isinstance(func, (EW_Function, EW_MFunction)):
+            raise_err(EW_TYPE_ERROR, f'Cannot memoize {type(func).__name__}')
+        store = MemoStore(func.name, function_hash(func), size)
+        return _memoize(func, PersistentMemoCache(store, size, func))
+    return decorator
+
+
+@pack_register
+def clear(func):
+    """清空记忆化函数缓存的结果（包括持久化保存的结果），统计数据保留
+    
+    Args:
+        func: 记忆化函数
+    """
+    if not isinstance(func, EW_MFunction):
+        raise_err(EW_TYPE_ERROR, f'Expected a memoized function, got {type(func).__name__}')
+    func._cache.clear()
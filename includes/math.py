@@ -1,18 +1,9 @@
 # math
 
-import os
-import sys
+import builtins
 
-# 获取当前文件所在目录的父目录（即项目根目录）
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)  # 项目根目录
-
-# 将core目录添加到系统路径
-core_dir = os.path.join(parent_dir, 'core')
-sys.path.insert(0, core_dir)
-
-from Type import EW_Number, EW_Boolean
-from Error import raise_err, EW_RUNTIME_ERROR
+from core.Type import EW_Number, EW_Boolean
+from core.Error import raise_err, EW_RUNTIME_ERROR
 
 packall = {}
 
@@ -20,6 +11,11 @@ def pack_register(thing):
     global packall
     packall[thing.__name__] = thing
 
+def _finite(a: EW_Number, name: str) -> None:
+    """检查数值是有限的（浮点数模式下可能为无穷大或NaN），无法取整"""
+    if not a._decimal.is_finite():
+        raise_err(EW_RUNTIME_ERROR, f'math.{name} expects a finite number, got {a}')
+
 @pack_register
 def add(a: EW_Number, b: EW_Number) -> EW_Number:
     """加法运算"""
@@ -47,7 +43,7 @@ def sqrt(a: EW_Number) -> EW_Number:
     """平方根运算"""
     if a._decimal < 0:
         raise_err(EW_RUNTIME_ERROR, 'Square root of negative number')
-    return EW_Number(str(a._decimal.sqrt()))
+    return EW_Number.from_decimal(a._decimal.sqrt())
 
 @pack_register
 def pow(a: EW_Number, b: EW_Number) -> EW_Number:
@@ -57,25 +53,28 @@ def pow(a: EW_Number, b: EW_Number) -> EW_Number:
 @pack_register
 def abs(a: EW_Number) -> EW_Number:
     """绝对值运算"""
-    return EW_Number(str(abs(a._decimal)))
+    return EW_Number.from_decimal(builtins.abs(a._num))
 
 @pack_register
 def floor(a: EW_Number) -> EW_Number:
     """向下取整"""
-    return EW_Number(str(a._decimal.to_integral_value(rounding='ROUND_FLOOR')))
+    _finite(a, 'floor')
+    return EW_Number.from_decimal(int(a._decimal.to_integral_value(rounding='ROUND_FLOOR')))
 
 @pack_register
 def ceil(a: EW_Number) -> EW_Number:
     """向上取整"""
-    return EW_Number(str(a._decimal.to_integral_value(rounding='ROUND_CEILING')))
+    _finite(a, 'ceil')
+    return EW_Number.from_decimal(int(a._decimal.to_integral_value(rounding='ROUND_CEILING')))
 
 @pack_register
 def round(a: EW_Number, digits: EW_Number = None) -> EW_Number:
     """四舍五入"""
     if digits is None:
-        return EW_Number(str(round(a._decimal)))
+        _finite(a, 'round')
+        return EW_Number.from_decimal(builtins.round(a._num))
     else:
-        return EW_Number(str(round(a._decimal, int(digits._decimal))))
+        return EW_Number.from_decimal(builtins.round(a._decimal, int(digits._num)))
 
 @pack_register
 def max(a: EW_Number, b: EW_Number) -> EW_Number:
@@ -90,9 +89,9 @@ def min(a: EW_Number, b: EW_Number) -> EW_Number:
 @pack_register
 def is_nan(a: EW_Number) -> EW_Boolean:
     """检查是否为NaN"""
-    return EW_Boolean(a._decimal.is_nan())
+    return EW_Boolean.of(a._decimal.is_nan())
 
 @pack_register
 def is_infinite(a: EW_Number) -> EW_Boolean:
     """检查是否为无穷大"""
-    return EW_Boolean(a._decimal.is_infinite())
+    return EW_Boolean.of(a._decimal.is_infinite())
@@ -1,17 +1,130 @@
-from EW_repl import repl
-from core.Parser import directly_run as run
+import os
 import sys
+from types import SimpleNamespace
+
+# 只导入解析命令行参数所需的模块；解释器在运行脚本时导入，REPL只在交互时导入
+from core.Type import DEFAULT_PRECISION, NUMERIC_MODES, NumericContext
+from core.Log import FileSink, configure_logging, parse_log_spec
+
+def parse_args(argv):
+    """解析命令行参数"""
+    if len(argv) == 1 and not argv[0].startswith('-'):
+        # 最常见的情况：只给出脚本路径，全部使用默认值，不必导入argparse
+        return SimpleNamespace(file=argv[0], precision=DEFAULT_PRECISION, numeric='rational', log=None, log_file=None,
+                               snapshot=None, from_snapshot=None, serve=None, connect=None, stdin=False)
+    
+    import argparse
+    parser = argparse.ArgumentParser(prog='Exwide', description='Exwide interpreter')
+    parser.add_argument('file', nargs='?', help='script to run, starts the REPL when omitted')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f'significant digits for Decimal arithmetic (default: {DEFAULT_PRECISION})')
+    parser.add_argument('--numeric', choices=NUMERIC_MODES, default='rational',
+                        help='number representation: exact rationals, Decimal quotients or binary floats (default: rational)')
+    parser.add_argument('--log', metavar='SPEC',
+                        help='debug logging, e.g. "debug" or "info,parser=debug,interp=debug" (default: off, or $EXWIDE_LOG)')
+    parser.add_argument('--log-file', metavar='PATH',
+                        help='write log lines to PATH instead of stdout (or $EXWIDE_LOG_FILE)')
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help='after running the script, save the interpreter state (globals, functions, mfunc caches) to PATH')
+    parser.add_argument('--from-snapshot', metavar='PATH',
+                        help='start from the interpreter state saved in PATH instead of a fresh one')
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='run a script server on a Unix socket path or a loopback [host]:port, with preforked warm workers')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes for --serve (default: 4)')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='per-script time limit in seconds for --serve and --connect (default: 30)')
+    parser.add_argument('--connect', metavar='ADDRESS',
+                        help='run the script on the server at ADDRESS instead of in this process')
+    parser.add_argument('--stdin', action='store_true',
+                        help='with --connect, read standard input here and send it to the script')
+    args = parser.parse_args(argv)
+    if args.connect and (args.serve or args.snapshot or args.from_snapshot):
+        parser.error('--connect cannot be combined with --serve or snapshots')
+    if args.stdin and not args.connect:
+        parser.error('--stdin requires --connect')
+    if args.file is None and (args.snapshot or args.connect):
+        parser.error('--snapshot and --connect require a script')
+    if args.file is None and args.from_snapshot and not args.serve:
+        parser.error('--from-snapshot requires a script or --serve')
+    return args
+
+def connect(args, code):
+    """在服务器上运行脚本，输出与返回状态与在本进程中运行相同"""
+    from core.Client import ServerError, request
+    # 只在指定--stdin时读取并提交标准输入，继承来的管道可能永远不会结束
+    stdin = sys.stdin.read() if args.stdin and sys.stdin is not None else ''
+    try:
+        response = request(args.connect, {'code': code, 'stdin': stdin, 'timeout': args.timeout,
+                                          'numeric': args.numeric, 'precision': args.precision})
+    except (OSError, ValueError, ServerError) as e:
+        print(f'Cannot reach server {args.connect}: {e}')
+        sys.exit(2)
+    sys.stdout.write(response.get('stdout', ''))
+    if response.get('status') != 'ok':
+        print(response.get('error'), file=sys.stderr)
+        sys.exit(1)
 
 if __name__ == '__main__':
-    args = sys.argv[1:]
-    if args == []:
-        repl()
-    elif len(args) == 1:
+    args = parse_args(sys.argv[1:])
+    try:
+        numeric = NumericContext(args.numeric, args.precision)
+        if args.log:
+            configure_logging(*parse_log_spec(args.log))
+        if args.log_file:
+            configure_logging(sink=FileSink(args.log_file))
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+    
+    if args.serve:
+        from core.Server import ScriptServer
+        env = None
+        if args.from_snapshot:
+            from core.Snapshot import SnapshotError, load_snapshot
+            try:
+                env = load_snapshot(args.from_snapshot)
+            except (SnapshotError, OSError) as e:
+                print(e)
+                sys.exit(2)
         try:
-            with open(args[0], 'r', encoding='utf-8') as f:
+            server = ScriptServer(args.serve, args.workers, args.timeout, env)
+        except ValueError as e:
+            print(e)
+            sys.exit(2)
+        with numeric:
+            server.serve_forever()
+    elif args.file is None:
+        from EW_repl import repl
+        repl(numeric)
+    else:
+        try:
+            with open(args.file, 'r', encoding='utf-8') as f:
                 code = f.read() + '\n'
-                run(code)
         except FileNotFoundError:
-            print(f'File {args[0]} not found')
-    else:
-        print('Unexpected argument')
\ No newline at end of file
+            print(f'File {args.file} not found')
+            sys.exit(1)
+        if args.connect:
+            connect(args, code)
+            sys.exit(0)
+        # 持久化缓存按脚本区分，不同脚本中的同名函数互不影响
+        from core.Cache import set_cache_namespace
+        set_cache_namespace(os.path.abspath(args.file))
+        from core.Parser import GENV, directly_run as run
+        if args.snapshot or args.from_snapshot:
+            from core.Snapshot import SnapshotError, load_snapshot, save_snapshot
+            env = GENV
+            if args.from_snapshot:
+                try:
+                    env = load_snapshot(args.from_snapshot)
+                except (SnapshotError, OSError) as e:
+                    print(e)
+                    sys.exit(2)
+            run(code, numeric, env)
+            if args.snapshot:
+                try:
+                    save_snapshot(args.snapshot, env)
+                except (SnapshotError, OSError) as e:
+                    print(e)
+                    sys.exit(2)
+        else:
+            run(code, numeric)
@@ -1,17 +1,10 @@
 # list
 
-import os
-import sys
+from core.Type import EW_List, EW_Number, EW_Type
+from core.Error import raise_err, EW_RUNTIME_ERROR, EW_TYPE_ERROR
+from core.Log import get_logger
 
-# 获取当前文件所在目录的父目录（即项目根目录）
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)  # 项目根目录
-
-# 将core目录添加到系统路径
-core_dir = os.path.join(parent_dir, 'core')
-sys.path.insert(0, core_dir)
-
-from Parser import *
+_log = get_logger('list')
 
 packall = {}
 
@@ -19,7 +12,61 @@ def pack_register(thing):
     global packall
     packall[thing.__name__] = thing
 
+def _index(nlist: EW_List, index: EW_Number, upper: int) -> int:
+    """检查并转换列表下标，合法范围为[0, upper]"""
+    if not isinstance(index, EW_Number) or not index._isint():
+        raise_err(EW_RUNTIME_ERROR, f'List index must be an integer, got {type(index).__name__}')
+    position = int(index._num)
+    if position < 0 or position > upper:
+        raise_err(EW_RUNTIME_ERROR, f'List index out of range: {position}')
+    return position
+
+def _check_list(nlist: EW_List, name: str) -> None:
+    """检查第一个参数是列表"""
+    if not isinstance(nlist, EW_List):
+        raise_err(EW_TYPE_ERROR, f'list.{name} expects a List, got {type(nlist).__name__}')
+
 @pack_register
 def push(nlist: EW_List, ins: EW_Type) -> EW_List:
-    clog(f'Running list.push, nlist: {nlist}, ins: {ins}')
-    return EW_List(nlist.value + [ins])
+    """返回在末尾添加元素后的新列表，原列表不变（只复制一次）"""
+    _check_list(nlist, 'push')
+    _log.debug('Running list.push, ins: %s', ins)
+    result = EW_List(nlist.to_list())
+    result.value.append(ins)
+    return result
+
+@pack_register
+def append(nlist: EW_List, ins: EW_Type) -> None:
+    """在列表末尾原地添加元素，均摊O(1)"""
+    _check_list(nlist, 'append')
+    nlist.value.append(ins)
+
+@pack_register
+def extend(nlist: EW_List, other: EW_List) -> None:
+    """将另一个列表的所有元素原地添加到末尾"""
+    _check_list(nlist, 'extend')
+    if not isinstance(other, EW_List):
+        raise_err(EW_TYPE_ERROR, f'list.extend expects a List, got {type(other).__name__}')
+    nlist.value.extend(other.to_list())
+
+@pack_register
+def pop(nlist: EW_List, index: EW_Number = None) -> EW_Type:
+    """原地移除并返回指定下标的元素，默认为最后一个（O(1)）"""
+    _check_list(nlist, 'pop')
+    if not len(nlist):
+        raise_err(EW_RUNTIME_ERROR, 'Pop from empty list')
+    if index is None:
+        return nlist.value.pop()
+    return nlist.value.pop(_index(nlist, index, len(nlist) - 1))
+
+@pack_register
+def insert(nlist: EW_List, index: EW_Number, ins: EW_Type) -> None:
+    """在指定下标处原地插入元素"""
+    _check_list(nlist, 'insert')
+    nlist.value.insert(_index(nlist, index, len(nlist)), ins)
+
+@pack_register
+def clear(nlist: EW_List) -> None:
+    """原地清空列表"""
+    _check_list(nlist, 'clear')
+    nlist.value.clear()
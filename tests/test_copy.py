@@ -0,0 +1,53 @@
+# copy()的回归测试：副本与原值之间、以及与复制前取得的子容器引用之间互不影响
+#
+# 运行：python -m unittest discover tests
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+# 将项目根目录添加到系统路径，保证可以导入core包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Env import Env
+from core.Parser import GENV, directly_run
+
+
+def run_ew(code):
+    """在新的全局环境中执行Exwide代码，返回输出的各行"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        directly_run(code + '\n', env=Env(**GENV.vals))
+    return out.getvalue().splitlines()
+
+
+class CopyTest(unittest.TestCase):
+    def test_alias_taken_before_copy(self):
+        self.assertEqual(run_ew('l = [1]\nt = {"a": l}\nc = copy(t)\nl[0] = 9\nprint(c)\nprint(t)'),
+                         ['{a: [1]}', '{a: [9]}'])
+
+    def test_child_read_before_copy(self):
+        self.assertEqual(run_ew('t = {"a": [1]}\nx = t["a"]\nc = copy(t)\nx[0] = 5\nprint(c)\nprint(t)'),
+                         ['{a: [1]}', '{a: [5]}'])
+
+    def test_nested_alias(self):
+        code = 'n = {"a": {"b": [1, 2]}}\ninner = n["a"]["b"]\nc = copy(n)\ninner[0] = 7\nc["a"]["b"][1] = 8\nprint(c)\nprint(n)'
+        self.assertEqual(run_ew(code), ['{a: {b: [1, 8]}}', '{a: {b: [7, 2]}}'])
+
+    def test_list_of_lists(self):
+        code = 'row = [1, 2]\nm = [row, [3]]\nc = copy(m)\nrow[0] = 0\nc[1][0] = 4\nprint(c)\nprint(m)'
+        self.assertEqual(run_ew(code), ['[[1, 2], [4]]', '[[0, 2], [3]]'])
+
+    def test_flat_copy_is_independent(self):
+        self.assertEqual(run_ew('f = [1, 2, 3]\ng = copy(f)\ng[0] = 5\nf[2] = 0\nprint(f)\nprint(g)'),
+                         ['[1, 2, 0]', '[5, 2, 3]'])
+
+    def test_cycle(self):
+        code = 's = {"k": 1}\ns["self"] = s\nc = copy(s)\nc["k"] = 2\nprint(s["k"], c["k"], c["self"]["k"])'
+        self.assertEqual(run_ew(code), ['1 2 2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
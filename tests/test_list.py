@@ -0,0 +1,97 @@
+# list包的原地操作与列表切片的回归测试：切片与原列表共享存储（写时复制），
+# 任何一方的修改都不影响另一方；下标越界与类型错误时报错
+#
+# 运行：python -m unittest discover tests
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+# 将项目根目录添加到系统路径，保证可以导入core包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Env import Env
+from core.Parser import GENV, directly_run
+
+
+def run_ew(code):
+    """在新的全局环境中执行Exwide代码，返回输出的各行"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        directly_run(code + '\n', env=Env(**GENV.vals))
+    return out.getvalue().splitlines()
+
+
+def run_error(code):
+    """执行应当报错的Exwide代码，返回输出（包括错误信息）"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        try:
+            directly_run(code + '\n', env=Env(**GENV.vals))
+        except Exception:
+            return out.getvalue()
+    raise AssertionError(f'no error, output: {out.getvalue()!r}')
+
+
+class ListOperationTest(unittest.TestCase):
+    def test_in_place_operations(self):
+        code = 'import list\na = [1, 2]\nlist.append(a, 3)\nlist.extend(a, [4, 5])\nlist.insert(a, 0, 0)\n' \
+               'list.insert(a, 6, 6)\nprint(a)\nprint(list.pop(a), list.pop(a, 0), a)\nlist.clear(a)\nprint(a, len(a))'
+        self.assertEqual(run_ew(code), ['[0, 1, 2, 3, 4, 5, 6]', '6 0 [1, 2, 3, 4, 5]', '[] 0'])
+
+    def test_push_returns_new_list(self):
+        self.assertEqual(run_ew('import list\na = [1]\nb = list.push(a, 2)\nprint(a, b)'), ['[1] [1, 2]'])
+
+    def test_out_of_range_index(self):
+        for call in ('list.pop(a, 3)', 'list.pop(a, 0 - 1)', 'list.insert(a, 4, 0)', 'list.insert(a, 0 - 1, 0)'):
+            with self.subTest(call=call):
+                output = run_error(f'import list\na = [1, 2, 3]\n{call}')
+                self.assertIn('List index out of range', output)
+
+    def test_pop_empty(self):
+        self.assertIn('Pop from empty list', run_error('import list\nlist.pop([])'))
+
+    def test_non_integer_index(self):
+        self.assertIn('List index must be an integer', run_error('import list\nlist.pop([1, 2], 1 / 2)'))
+
+    def test_first_argument_must_be_list(self):
+        for name in ('append(t, 1)', 'extend(t, [1])', 'pop(t)', 'insert(t, 0, 1)', 'clear(t)', 'push(t, 1)'):
+            with self.subTest(name=name):
+                self.assertIn('expects a List', run_error(f'import list\nt = {{"a": 1}}\nlist.{name}'))
+
+
+class ListSliceTest(unittest.TestCase):
+    def test_bounds(self):
+        self.assertEqual(run_ew('a = [1, 2, 3, 4]\nprint(a[1:3], a[:2], a[2:], a[:], a[2:2], len(a[1:3]))'),
+                         ['[2, 3] [1, 2] [3, 4] [1, 2, 3, 4] [] 2'])
+
+    def test_out_of_range_slice(self):
+        for bounds in ('(0 - 1):2', '0:5', '3:1'):
+            with self.subTest(bounds=bounds):
+                self.assertIn('List slice out of range', run_error(f'a = [1, 2, 3, 4]\nprint(a[{bounds}])'))
+
+    def test_write_through_slice(self):
+        code = 'import list\na = [1, 2, 3, 4, 5]\ns = a[1:4]\ns[0] = 9\nlist.append(s, 8)\nprint(a)\nprint(s)'
+        self.assertEqual(run_ew(code), ['[1, 2, 3, 4, 5]', '[9, 3, 4, 8]'])
+
+    def test_write_parent_after_slice(self):
+        code = 'import list\na = [1, 2, 3, 4, 5]\ns = a[1:4]\nt = a[3:]\na[2] = 7\nlist.pop(a)\n' \
+               'list.insert(a, 0, 0)\nprint(a)\nprint(s, t)'
+        self.assertEqual(run_ew(code), ['[0, 1, 2, 7, 4]', '[2, 3, 4] [4, 5]'])
+
+    def test_slice_of_slice(self):
+        code = 'import list\na = [1, 2, 3, 4, 5]\ns = a[1:]\nw = s[1:3]\nlist.clear(s)\na[2] = 0\nw[0] = 6\n' \
+               'print(a, s, w)'
+        self.assertEqual(run_ew(code), ['[1, 2, 0, 4, 5] [] [6, 4]'])
+
+    def test_index_out_of_range_on_slice(self):
+        self.assertIn('List index out of range', run_error('a = [1, 2, 3]\ns = a[1:]\ns[2] = 0'))
+
+    def test_slice_non_list(self):
+        self.assertIn('Expected List for slicing', run_error('t = {"a": 1}\nprint(t[0:1])'))
+
+
+if __name__ == '__main__':
+    unittest.main()
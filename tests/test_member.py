@@ -0,0 +1,56 @@
+# 点号成员访问的回归测试：访问处缓存的包成员，以及对非Table、List、包的值访问成员时报错
+#
+# 运行：python -m unittest discover tests
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+# 将项目根目录添加到系统路径，保证可以导入core包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Env import Env
+from core.Parser import GENV, directly_run
+
+
+def run_ew(code):
+    """在新的全局环境中执行Exwide代码，返回输出的各行"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        directly_run(code + '\n', env=Env(**GENV.vals))
+    return out.getvalue().splitlines()
+
+
+def run_error(code):
+    """执行应当报错的Exwide代码，返回输出（包括错误信息）"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        try:
+            directly_run(code + '\n', env=Env(**GENV.vals))
+        except Exception:
+            return out.getvalue()
+    raise AssertionError(f'no error, output: {out.getvalue()!r}')
+
+
+class MemberAccessTest(unittest.TestCase):
+    def test_package_member_in_loop(self):
+        code = 'import list\nl = []\ni = 0\nwhile (i < 3) {\n    l = list.push(l, i)\n    i = i + 1\n}\nprint(l)'
+        self.assertEqual(run_ew(code), ['[0, 1, 2]'])
+
+    def test_table_member(self):
+        self.assertEqual(run_ew('t = {"foo": 1}\nprint(t.foo)'), ['1'])
+
+    def test_member_of_none(self):
+        # 新的访问处尚未缓存任何包，None不能命中缓存
+        output = run_error('func f() {\n    x = 1\n}\nprint(f().foo)')
+        self.assertIn('Expected Table, List or Package', output)
+
+    def test_member_of_none_after_package(self):
+        code = 'import list\nfunc g(p) {\n    return p.push\n}\ng(list)\nfunc f() {\n    x = 1\n}\ng(f())'
+        self.assertIn('Expected Table, List or Package', run_error(code))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# deco.persist()的回归测试：布尔值参数与函数体中的布尔字面量、无法持久化的参数，
+# 以及结果在新进程中从磁盘读回
+#
+# 运行：python -m unittest discover tests
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+# 将项目根目录添加到系统路径，保证可以导入core包
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.Cache import CACHE_DIR_ENV
+from core.Env import Env
+from core.Parser import GENV, directly_run
+
+
+def run_ew(code):
+    """在新的全局环境中执行Exwide代码，返回输出的各行"""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        directly_run(code + '\n', env=Env(**GENV.vals))
+    return out.getvalue().splitlines()
+
+
+class PersistTest(unittest.TestCase):
+    def setUp(self):
+        # 每个测试使用单独的缓存目录，互不影响，也不写入用户的缓存
+        self._dir = tempfile.TemporaryDirectory()
+        self._old = os.environ.get(CACHE_DIR_ENV)
+        os.environ[CACHE_DIR_ENV] = self._dir.name
+
+    def tearDown(self):
+        if self._old is None:
+            os.environ.pop(CACHE_DIR_ENV, None)
+        else:
+            os.environ[CACHE_DIR_ENV] = self._old
+        self._dir.cleanup()
+
+    def test_boolean_argument(self):
+        code = 'import deco\ndeco.persist() func f(b) { return b }\nprint(f(true), f(false), f(true))\n' \
+               'print(memo_stats(f)["hits"], memo_stats(f)["disk_size"])'
+        self.assertEqual(run_ew(code), ['true false true', '1 2'])
+
+    def test_boolean_literal_in_body(self):
+        code = 'import deco\ndeco.persist() func g(x) {\n    if (x == 1) { return true }\n    return false\n}\n' \
+               'print(g(1), g(2), g(1))'
+        self.assertEqual(run_ew(code), ['true false true'])
+
+    def test_boolean_global(self):
+        code = 'import deco\nflag = true\ndeco.persist() func h(x) { return [x, flag] }\nprint(h(1))\n' \
+               'flag = false\nprint(h(1))'
+        self.assertEqual(run_ew(code), ['[1, true]', '[1, false]'])
+
+    def test_unfingerprintable_argument(self):
+        # 函数参数无法作为缓存键，不使用缓存，直接调用
+        code = 'import deco\nfunc two(x) { return x * 2 }\ndeco.persist() func ap(h) { return h(3) }\n' \
+               'print(ap(two), ap(two))\nprint(memo_stats(ap)["disk_size"])'
+        self.assertEqual(run_ew(code), ['6 6', '0'])
+
+    def test_reload_across_processes(self):
+        script = os.path.join(self._dir.name, 'reload.ew')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write('import deco\ndeco.persist() func sq(n, b) { return [n * n, b] }\n'
+                    'print(sq(4, true))\nprint(memo_stats(sq)["disk_hits"])\n')
+
+        def run():
+            result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), script],
+                                    capture_output=True, text=True, env=dict(os.environ), check=True)
+            return result.stdout.splitlines()
+
+        self.assertEqual(run(), ['[16, true]', '0'])
+        self.assertEqual(run(), ['[16, true]', '1'])
+
+
+if __name__ == '__main__':
+    unittest.main()